@@ -9,6 +9,10 @@ from . import config  # noqa: F401  # ensure env vars loaded early
 
 logger = Logger()
 
+# Client id/secret are stable for a container's lifetime; keep them cached across warm invocations
+# instead of the Parameters utility's 5s default.
+CREDENTIALS_MAX_AGE_SECONDS = 900
+
 
 class FitbitClient:
     """Encapsulates Fitbit Web API calls used by the service.
@@ -25,8 +29,8 @@ class FitbitClient:
         self.client_secret_name = client_secret_name
 
     def _get_client_credentials(self) -> tuple[str, str]:
-        client_id = parameters.get_parameter(self.client_id_param_name)
-        client_secret = parameters.get_secret(self.client_secret_name)
+        client_id = parameters.get_parameter(self.client_id_param_name, max_age=CREDENTIALS_MAX_AGE_SECONDS)
+        client_secret = parameters.get_secret(self.client_secret_name, max_age=CREDENTIALS_MAX_AGE_SECONDS)
         return client_id, client_secret
 
     @staticmethod
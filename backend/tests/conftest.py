@@ -1,29 +1,34 @@
 import contextlib
 import os
 from collections.abc import Iterator
+from typing import Any
 
 import boto3
 import pytest
+from botocore.config import Config
 from moto import mock_aws
 
-# Ensure AWS SDK has a region and fake credentials for moto
-os.environ.setdefault("AWS_REGION", "us-east-1")
-os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
-os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
-os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
-os.environ.setdefault("AWS_SESSION_TOKEN", "testing")
+_ENV_DEFAULTS: dict[str, str] = {
+    # Ensure AWS SDK has a region and fake credentials for moto
+    "AWS_REGION": "us-east-1",
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+    # Environment variables read at import time by common.config
+    "ENV_READINGS_TABLE": "env_readings",
+    "SLEEP_SESSIONS_TABLE": "sleep_sessions",
+    "INGEST_SHARED_SECRET_NAME": "ingest/shared/secret",
+    # Defaults for Fitbit handlers
+    "FITBIT_CLIENT_ID_PARAM_NAME": "fitbit/client/id",
+    "FITBIT_CODE_VERIFIER_SECRET_NAME": "fitbit/code/verifier",
+    "FITBIT_REFRESH_SECRET_NAME": "fitbit/refresh/token",
+    "FITBIT_CLIENT_SECRET_NAME": "fitbit/client/secret",
+}
+os.environ.update({k: v for k, v in _ENV_DEFAULTS.items() if k not in os.environ})
 
-
-# Environment variables read at import time by common.config
-os.environ.setdefault("ENV_READINGS_TABLE", "env_readings")
-os.environ.setdefault("SLEEP_SESSIONS_TABLE", "sleep_sessions")
-os.environ.setdefault("INGEST_SHARED_SECRET_NAME", "ingest/shared/secret")
-
-# Defaults for Fitbit handlers
-os.environ.setdefault("FITBIT_CLIENT_ID_PARAM_NAME", "fitbit/client/id")
-os.environ.setdefault("FITBIT_CODE_VERIFIER_SECRET_NAME", "fitbit/code/verifier")
-os.environ.setdefault("FITBIT_REFRESH_SECRET_NAME", "fitbit/refresh/token")
-os.environ.setdefault("FITBIT_CLIENT_SECRET_NAME", "fitbit/client/secret")
+# Shared by the session-scoped client fixtures so connections are pooled and kept alive
+_BOTO_CONFIG = Config(tcp_keepalive=True, max_pool_connections=50, retries={"mode": "standard", "max_attempts": 3})
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -81,3 +86,23 @@ def aws_moto() -> Iterator[None]:
             secrets.create_secret(Name=os.environ["FITBIT_CLIENT_SECRET_NAME"], SecretString="SECRET")
 
         yield
+
+
+@pytest.fixture(scope="session")
+def ddb_resource(aws_moto: None) -> Any:
+    return boto3.resource("dynamodb", config=_BOTO_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def ddb_client(aws_moto: None) -> Any:
+    return boto3.client("dynamodb", config=_BOTO_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def ssm_client(aws_moto: None) -> Any:
+    return boto3.client("ssm", config=_BOTO_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def secrets_client(aws_moto: None) -> Any:
+    return boto3.client("secretsmanager", config=_BOTO_CONFIG)
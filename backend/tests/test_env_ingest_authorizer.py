@@ -1,15 +1,15 @@
 import os
 from typing import Any
 
-import boto3
+from src.env_ingest_authorizer.handler import lambda_handler
 
 from .utils import FakeLambdaContext
 
+_CTX = FakeLambdaContext()
 
-def _invoke(event: dict[str, Any]) -> dict[str, Any]:
-    from src.env_ingest_authorizer.handler import lambda_handler  # import after env/moto ready
 
-    return lambda_handler(event, FakeLambdaContext())
+def _invoke(event: dict[str, Any]) -> dict[str, Any]:
+    return lambda_handler(event, _CTX)
 
 
 def test_missing_header_denied(aws_moto: None) -> None:  # type: ignore[unused-ignore]
@@ -23,9 +23,8 @@ def test_missing_header_denied(aws_moto: None) -> None:  # type: ignore[unused-i
     assert res["policyDocument"]["Statement"][0]["Effect"] == "Deny"
 
 
-def test_wrong_secret_denied(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    secrets = boto3.client("secretsmanager")
-    secrets.put_secret_value(SecretId=os.environ["INGEST_SHARED_SECRET_NAME"], SecretString="EXPECTED")
+def test_wrong_secret_denied(secrets_client: Any) -> None:
+    secrets_client.put_secret_value(SecretId=os.environ["INGEST_SHARED_SECRET_NAME"], SecretString="EXPECTED")
 
     event: dict[str, Any] = {
         "type": "TOKEN",
@@ -36,9 +35,8 @@ def test_wrong_secret_denied(aws_moto: None) -> None:  # type: ignore[unused-ign
     assert res["policyDocument"]["Statement"][0]["Effect"] == "Deny"
 
 
-def test_correct_secret_allowed(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    secrets = boto3.client("secretsmanager")
-    secrets.put_secret_value(SecretId=os.environ["INGEST_SHARED_SECRET_NAME"], SecretString="EXPECTED")
+def test_correct_secret_allowed(secrets_client: Any) -> None:
+    secrets_client.put_secret_value(SecretId=os.environ["INGEST_SHARED_SECRET_NAME"], SecretString="EXPECTED")
 
     event: dict[str, Any] = {
         "type": "TOKEN",
@@ -1,139 +1,83 @@
 import json
 from typing import Any
 
-import boto3
 import pytest
 from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
 from botocore.exceptions import ClientError
 from pydantic import ValidationError
 
-from src.env_ingest_consumer.handler import record_handler
+import src.env_ingest_consumer.handler as consumer
+from src.env_ingest_consumer.handler import lambda_handler, record_handler
 
 from .utils import FakeLambdaContext
 
-
-def test_record_handler_happy_path(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
-
-    from src.env_ingest_consumer.handler import record_handler
-
-    payload = {
-        "day": "2025-01-01",
-        "ts_min": 1,
-    }
-    record = SQSRecord(
-        {
-            "messageId": "1",
-            "receiptHandle": "r",
-            "body": json.dumps(payload),
-            "attributes": {},
-            "messageAttributes": {},
-            "md5OfBody": "x",
-            "eventSource": "aws:sqs",
-            "eventSourceARN": "arn",
-            "awsRegion": "us-east-1",
-        }
-    )
+_CTX = FakeLambdaContext()
+
+_SQS_ENVELOPE: dict[str, Any] = {
+    "messageId": "1",
+    "receiptHandle": "r",
+    "attributes": {},
+    "messageAttributes": {},
+    "md5OfBody": "x",
+    "eventSource": "aws:sqs",
+    "eventSourceARN": "arn",
+    "awsRegion": "us-east-1",
+}
+_READING: dict[str, Any] = {"day": "2025-01-01", "ts_min": 1}
+_BODY_OK = json.dumps(_READING)
+# Syntactically valid JSON that fails pydantic validation (missing required keys)
+_BODY_BAD = json.dumps({"temp_c": 20.0})
+
+
+@pytest.mark.parametrize(
+    ("body", "seed", "put_error_code", "expected_exc"),
+    [
+        pytest.param(_BODY_OK, False, None, None, id="happy_path"),
+        # Seeding an existing item triggers ConditionalCheckFailedException; handler should swallow it
+        pytest.param(_BODY_OK, True, None, None, id="duplicate_treated_as_success"),
+        pytest.param(_BODY_BAD, False, None, ValidationError, id="invalid_json_raises"),
+        pytest.param(
+            _BODY_OK,
+            False,
+            "ProvisionedThroughputExceededException",
+            ClientError,
+            id="other_client_error_propagates",
+        ),
+    ],
+)
+def test_record_handler(
+    monkeypatch: pytest.MonkeyPatch,
+    ddb_resource: Any,
+    body: str,
+    seed: bool,
+    put_error_code: str | None,
+    expected_exc: type[Exception] | None,
+) -> None:
+    table = ddb_resource.Table("env_readings")
+    if seed:
+        table.put_item(Item=_READING)
+    if put_error_code is not None:
+
+        def fake_put_env_reading(_ddb: Any, _item: dict[str, Any]) -> None:
+            raise ClientError({"Error": {"Code": put_error_code}}, "PutItem")
+
+        monkeypatch.setattr(consumer, "put_env_reading", fake_put_env_reading)
+
+    record = SQSRecord({**_SQS_ENVELOPE, "body": body})
+
+    if expected_exc is not None:
+        with pytest.raises(expected_exc):
+            record_handler(record)
+        return
 
     record_handler(record)
-
-    ddb = boto3.resource("dynamodb")
-    table = ddb.Table("env_readings")
-    resp = table.get_item(Key={"day": "2025-01-01", "ts_min": 1})
+    resp = table.get_item(Key=_READING)
     assert "Item" in resp
 
 
-def test_record_handler_duplicate_treated_as_success(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    # Seed an existing item to trigger ConditionalCheckFailedException
-    ddb = boto3.resource("dynamodb")
-    table = ddb.Table("env_readings")
-    table.put_item(Item={"day": "2025-01-01", "ts_min": 1})
-
-    record = SQSRecord(
-        {
-            "messageId": "1",
-            "receiptHandle": "r",
-            "body": json.dumps({"day": "2025-01-01", "ts_min": 1}),
-            "attributes": {},
-            "messageAttributes": {},
-            "md5OfBody": "x",
-            "eventSource": "aws:sqs",
-            "eventSourceARN": "arn",
-            "awsRegion": "us-east-1",
-        }
-    )
-
-    # The helper will attempt a conditional put; because item exists, boto3 will raise
-    # ConditionalCheckFailedException; handler should swallow it and not raise.
-    record_handler(record)
-
-
-def test_record_handler_invalid_json_raises(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    # Provide syntactically valid JSON that fails pydantic validation (missing required keys)
-    record = SQSRecord(
-        {
-            "messageId": "1",
-            "receiptHandle": "r",
-            "body": json.dumps({"temp_c": 20.0}),
-            "attributes": {},
-            "messageAttributes": {},
-            "md5OfBody": "x",
-            "eventSource": "aws:sqs",
-            "eventSourceARN": "arn",
-            "awsRegion": "us-east-1",
-        }
-    )
-
-    with pytest.raises(ValidationError):
-        record_handler(record)
-
-
-def test_record_handler_other_client_error_propagates(monkeypatch: pytest.MonkeyPatch, aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    import src.env_ingest_consumer.handler as consumer
-
-    def fake_put_env_reading(_ddb: Any, _item: dict[str, Any]) -> None:
-        error_response = {"Error": {"Code": "ProvisionedThroughputExceededException"}}
-        raise ClientError(error_response, "PutItem")
-
-    monkeypatch.setattr(consumer, "put_env_reading", fake_put_env_reading)
-
-    record = SQSRecord(
-        {
-            "messageId": "1",
-            "receiptHandle": "r",
-            "body": json.dumps({"day": "2025-01-01", "ts_min": 1}),
-            "attributes": {},
-            "messageAttributes": {},
-            "md5OfBody": "x",
-            "eventSource": "aws:sqs",
-            "eventSourceARN": "arn",
-            "awsRegion": "us-east-1",
-        }
-    )
-
-    with pytest.raises(ClientError):
-        consumer.record_handler(record)
-
-
 def test_lambda_handler_single_record_success(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    from src.env_ingest_consumer.handler import lambda_handler
-
-    event = {
-        "Records": [
-            {
-                "messageId": "1",
-                "receiptHandle": "r",
-                "body": json.dumps({"day": "2025-01-01", "ts_min": 1}),
-                "attributes": {},
-                "messageAttributes": {},
-                "md5OfBody": "x",
-                "eventSource": "aws:sqs",
-                "eventSourceARN": "arn",
-                "awsRegion": "us-east-1",
-            }
-        ]
-    }
+    event = {"Records": [{**_SQS_ENVELOPE, "body": _BODY_OK}]}
 
-    res = lambda_handler(event, FakeLambdaContext())
+    res = lambda_handler(event, _CTX)
     assert "batchItemFailures" in res
     assert res["batchItemFailures"] == []
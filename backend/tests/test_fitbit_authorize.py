@@ -1,26 +1,24 @@
 import os
+from typing import Any
 from urllib.parse import parse_qs, urlparse
 
-import boto3
-
 from src.fitbit_authorize.handler import lambda_handler
 
 from .utils import FakeLambdaContext
 
+_CTX = FakeLambdaContext()
 
-def test_builds_redirect_and_persists_code_verifier(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    # Ensure client id exists in SSM and code verifier secret exists in Secrets Manager
-    ssm = boto3.client("ssm")
-    secrets = boto3.client("secretsmanager")
 
-    ssm.put_parameter(
+def test_builds_redirect_and_persists_code_verifier(ssm_client: Any, secrets_client: Any) -> None:
+    # Ensure client id exists in SSM and code verifier secret exists in Secrets Manager
+    ssm_client.put_parameter(
         Name=os.environ["FITBIT_CLIENT_ID_PARAM_NAME"],
         Type="String",
         Value="CLIENT123",
         Overwrite=True,
     )
 
-    res = lambda_handler({}, FakeLambdaContext())
+    res = lambda_handler({}, _CTX)
     assert res["statusCode"] == 302
     location = res["headers"]["Location"]
 
@@ -38,6 +36,6 @@ def test_builds_redirect_and_persists_code_verifier(aws_moto: None) -> None:  #
     # A code_verifier should have been written
     secret_name = os.environ["FITBIT_CODE_VERIFIER_SECRET_NAME"]
     # moto stores latest secret value in SecretString
-    val = secrets.get_secret_value(SecretId=secret_name)["SecretString"]
+    val = secrets_client.get_secret_value(SecretId=secret_name)["SecretString"]
     assert isinstance(val, str)
     assert len(val) >= 43
@@ -1,63 +1,81 @@
 import json
 import os
 from typing import Any
-from unittest.mock import Mock, patch
 
-import boto3
+import pytest
+
+from src.fitbit_callback.handler import lambda_handler
 
 from .utils import FakeLambdaContext
 
+_CTX = FakeLambdaContext()
 
-def _invoke(event: dict[str, Any]) -> dict[str, Any]:
-    from src.fitbit_callback.handler import lambda_handler
+# Resolved once; conftest sets these defaults before test modules are imported
+_CLIENT_ID_PARAM_NAME = os.environ["FITBIT_CLIENT_ID_PARAM_NAME"]
+_CODE_VERIFIER_SECRET_NAME = os.environ["FITBIT_CODE_VERIFIER_SECRET_NAME"]
+_REFRESH_SECRET_NAME = os.environ["FITBIT_REFRESH_SECRET_NAME"]
+
+
+class _UrlopenResponse:
+    """Stand-in for the context manager returned by urllib.request.urlopen."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    def __enter__(self) -> "_UrlopenResponse":
+        return self
 
-    return lambda_handler(event, FakeLambdaContext())
+    def __exit__(self, *_args: Any) -> bool:
+        return False
 
+    def read(self) -> bytes:
+        return self._body
 
-def test_happy_path_persists_refresh_token(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    ssm = boto3.client("ssm")
-    secrets = boto3.client("secretsmanager")
 
-    ssm.put_parameter(
-        Name=os.environ["FITBIT_CLIENT_ID_PARAM_NAME"],
+def _invoke(event: dict[str, Any]) -> dict[str, Any]:
+    return lambda_handler(event, _CTX)
+
+
+def test_happy_path_persists_refresh_token(
+    monkeypatch: pytest.MonkeyPatch, ssm_client: Any, secrets_client: Any
+) -> None:
+    ssm_client.put_parameter(
+        Name=_CLIENT_ID_PARAM_NAME,
         Type="String",
         Value="CLIENT123",
         Overwrite=True,
     )
     # Provide code_verifier in secrets; client secret is provided by conftest
-    secrets.put_secret_value(SecretId=os.environ["FITBIT_CODE_VERIFIER_SECRET_NAME"], SecretString="VERIFIER")
+    secrets_client.put_secret_value(SecretId=_CODE_VERIFIER_SECRET_NAME, SecretString="VERIFIER")
 
     # Mock network call
     token_payload = {"refresh_token": "REFRESH"}
-    mock_resp = Mock()
-    mock_resp.read.return_value = json.dumps(token_payload).encode("utf-8")
-    mock_cm = Mock()
-    mock_cm.__enter__ = lambda s: mock_resp
-    mock_cm.__exit__ = lambda *args, **kwargs: False
-
-    with patch("src.fitbit_callback.handler.urllib.request.urlopen", return_value=mock_cm):
-        res = _invoke({"queryStringParameters": {"code": "AUTHCODE"}})
+    body = json.dumps(token_payload).encode("utf-8")
+    monkeypatch.setattr("src.fitbit_callback.handler.urllib.request.urlopen", lambda *_a, **_kw: _UrlopenResponse(body))
+    res = _invoke({"queryStringParameters": {"code": "AUTHCODE"}})
 
     assert res["statusCode"] == 200
-    stored = secrets.get_secret_value(SecretId=os.environ["FITBIT_REFRESH_SECRET_NAME"])  # type: ignore[assignment]
+    stored = secrets_client.get_secret_value(SecretId=_REFRESH_SECRET_NAME)  # type: ignore[assignment]
     assert stored["SecretString"] == "REFRESH"
 
 
-def test_token_exchange_failure_returns_502(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    ssm = boto3.client("ssm")
-    secrets = boto3.client("secretsmanager")
-
-    ssm.put_parameter(
-        Name=os.environ["FITBIT_CLIENT_ID_PARAM_NAME"],
+def test_token_exchange_failure_returns_502(
+    monkeypatch: pytest.MonkeyPatch, ssm_client: Any, secrets_client: Any
+) -> None:
+    ssm_client.put_parameter(
+        Name=_CLIENT_ID_PARAM_NAME,
         Type="String",
         Value="CLIENT123",
         Overwrite=True,
     )
     # Provide code_verifier in secrets; client secret is provided by conftest
-    secrets.put_secret_value(SecretId=os.environ["FITBIT_CODE_VERIFIER_SECRET_NAME"], SecretString="VERIFIER")
+    secrets_client.put_secret_value(SecretId=_CODE_VERIFIER_SECRET_NAME, SecretString="VERIFIER")
+
+    def _failing_urlopen(*_args: Any, **_kwargs: Any) -> Any:
+        raise Exception("boom")
 
-    with patch("src.fitbit_callback.handler.urllib.request.urlopen", side_effect=Exception("boom")):
-        res = _invoke({"queryStringParameters": {"code": "AUTHCODE"}})
+    monkeypatch.setattr("src.fitbit_callback.handler.urllib.request.urlopen", _failing_urlopen)
+    res = _invoke({"queryStringParameters": {"code": "AUTHCODE"}})
 
     assert res["statusCode"] == 502
     body = json.loads(res["body"])
@@ -1,23 +1,30 @@
 import os
 from datetime import UTC, datetime
 from typing import Any
-from unittest.mock import patch
 
-import boto3
 import pytest
+from aws_lambda_powertools.utilities import parameters
+from aws_lambda_powertools.utilities.parameters.secrets import SecretsProvider
+from aws_lambda_powertools.utilities.parameters.ssm import SSMProvider
+
+from src.common.fitbit_client import FitbitClient
+from src.fitbit_fetch.handler import lambda_handler
 
 from .utils import FakeLambdaContext
 
+_CTX = FakeLambdaContext()
+
+# Resolved once; conftest sets these defaults before test modules are imported
+_REFRESH_SECRET_NAME = os.environ["FITBIT_REFRESH_SECRET_NAME"]
+_SLEEP_SESSIONS_TABLE = os.environ["SLEEP_SESSIONS_TABLE"]
 
-def _invoke(event: dict[str, Any]) -> dict[str, Any]:
-    from src.fitbit_fetch.handler import lambda_handler
 
-    return lambda_handler(event, FakeLambdaContext())
+def _invoke(event: dict[str, Any]) -> dict[str, Any]:
+    return lambda_handler(event, _CTX)
 
 
-def _set_refresh_token(value: str) -> None:
-    secrets = boto3.client("secretsmanager")
-    secrets.put_secret_value(SecretId=os.environ["FITBIT_REFRESH_SECRET_NAME"], SecretString=value)
+def _set_refresh_token(secrets_client: Any, value: str) -> None:
+    secrets_client.put_secret_value(SecretId=_REFRESH_SECRET_NAME, SecretString=value)
 
 
 def _token_response(access: str = "AT", refresh: str = "RT") -> Any:
@@ -63,29 +70,26 @@ def _sleep_response(date_str: str) -> Any:
     return _Resp()
 
 
-def test_happy_path_writes_segments(aws_moto: None) -> None:  # type: ignore[unused-ignore]
+def test_happy_path_writes_segments(monkeypatch: pytest.MonkeyPatch, secrets_client: Any, ddb_client: Any) -> None:
     # Arrange
-    _set_refresh_token("REFRESH0")
+    _set_refresh_token(secrets_client, "REFRESH0")
     today = datetime.now(UTC).strftime("%Y-%m-%d")
 
-    with (
-        patch("src.common.fitbit_client.requests.post", return_value=_token_response()),
-        patch("src.common.fitbit_client.requests.get", return_value=_sleep_response(today)),
-    ):
-        res = _invoke({"source": "aws.events"})
+    monkeypatch.setattr("src.common.fitbit_client.requests.post", lambda *_a, **_kw: _token_response())
+    monkeypatch.setattr("src.common.fitbit_client.requests.get", lambda *_a, **_kw: _sleep_response(today))
+    res = _invoke({"source": "aws.events"})
 
     assert res["ok"] is True
     assert res["segments"] == 2
 
     # Validate they were written
-    ddb = boto3.client("dynamodb")
-    items = ddb.scan(TableName=os.environ["SLEEP_SESSIONS_TABLE"])  # type: ignore[assignment]
+    items = ddb_client.scan(TableName=_SLEEP_SESSIONS_TABLE)  # type: ignore[assignment]
     # Two segments should exist
     assert len(items["Items"]) == 2
 
 
-def test_skips_classic_logs(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    _set_refresh_token("REFRESH0")
+def test_skips_classic_logs(monkeypatch: pytest.MonkeyPatch, secrets_client: Any) -> None:
+    _set_refresh_token(secrets_client, "REFRESH0")
     today = datetime.now(UTC).strftime("%Y-%m-%d")
 
     class _SleepResp:
@@ -101,18 +105,16 @@ def test_skips_classic_logs(aws_moto: None) -> None:  # type: ignore[unused-igno
                 ]
             }
 
-    with (
-        patch("src.common.fitbit_client.requests.post", return_value=_token_response()),
-        patch("src.common.fitbit_client.requests.get", return_value=_SleepResp()),
-    ):
-        res = _invoke({})
+    monkeypatch.setattr("src.common.fitbit_client.requests.post", lambda *_a, **_kw: _token_response())
+    monkeypatch.setattr("src.common.fitbit_client.requests.get", lambda *_a, **_kw: _SleepResp())
+    res = _invoke({})
 
     assert res["ok"] is True
     assert res["segments"] == 0
 
 
-def test_error_from_token_refresh_is_reported(aws_moto: None) -> None:  # type: ignore[unused-ignore]
-    _set_refresh_token("REFRESH0")
+def test_error_from_token_refresh_is_reported(monkeypatch: pytest.MonkeyPatch, secrets_client: Any) -> None:
+    _set_refresh_token(secrets_client, "REFRESH0")
 
     class _BadResp:
         status_code = 400
@@ -123,5 +125,31 @@ def test_error_from_token_refresh_is_reported(aws_moto: None) -> None:  # type:
         def json(self) -> dict[str, Any]:  # pragma: no cover - not used
             return {}
 
-    with patch("src.common.fitbit_client.requests.post", return_value=_BadResp()), pytest.raises(RuntimeError):
+    monkeypatch.setattr("src.common.fitbit_client.requests.post", lambda *_a, **_kw: _BadResp())
+    with pytest.raises(RuntimeError):
         _invoke({})
+
+
+def test_client_credentials_are_fetched_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    parameters.clear_caches()
+    calls = {"ssm": 0, "secrets": 0}
+    orig_ssm_get = SSMProvider._get
+    orig_secrets_get = SecretsProvider._get
+
+    def _ssm_get(self: SSMProvider, name: str, *args: Any, **kwargs: Any) -> Any:
+        calls["ssm"] += 1
+        return orig_ssm_get(self, name, *args, **kwargs)
+
+    def _secrets_get(self: SecretsProvider, name: str, **kwargs: Any) -> Any:
+        calls["secrets"] += 1
+        return orig_secrets_get(self, name, **kwargs)
+
+    monkeypatch.setattr(SSMProvider, "_get", _ssm_get)
+    monkeypatch.setattr(SecretsProvider, "_get", _secrets_get)
+    client = FitbitClient(os.environ["FITBIT_CLIENT_ID_PARAM_NAME"], os.environ["FITBIT_CLIENT_SECRET_NAME"])
+
+    first = client._get_client_credentials()
+    second = client._get_client_credentials()
+
+    assert first == second
+    assert calls == {"ssm": 1, "secrets": 1}
@@ -3,7 +3,7 @@ import os
 import sys
 import time
 
-from .reader import BME680Reader
+from .reader import BME680Reader, BME680Sample
 
 
 def _parse_int(value: str | None, default: int) -> int:
@@ -15,6 +15,10 @@ def _parse_int(value: str | None, default: int) -> int:
         return default
 
 
+def _thp_missing(sample: BME680Sample) -> bool:
+    return sample.temperature_c is None and sample.humidity_pct is None and sample.pressure_hpa is None
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     bus = _parse_int(os.environ.get("I2C_BUS"), 1)
@@ -36,12 +40,7 @@ def main() -> None:
     # Poll for temperature/humidity/pressure readiness
     start = time.monotonic()
     sample = reader.read()
-    while (
-        time.monotonic() - start < timeout_secs
-        and sample.temperature_c is None
-        and sample.humidity_pct is None
-        and sample.pressure_hpa is None
-    ):
+    while time.monotonic() - start < timeout_secs and _thp_missing(sample):
         time.sleep(poll_ms / 1000.0)
         sample = reader.read()
 
@@ -53,7 +52,7 @@ def main() -> None:
             time.sleep(poll_ms / 1000.0)
             sample = reader.read()
 
-    if not (sample.temperature_c is None and sample.humidity_pct is None and sample.pressure_hpa is None):
+    if not _thp_missing(sample):
         logging.info(
             "T/H/P ready: temp=%sC hum=%s%% pres=%shPa",
             sample.temperature_c,
@@ -70,7 +69,7 @@ def main() -> None:
         f"gas_heat_stable={sample.gas_heat_stable}"
     )
 
-    if sample.temperature_c is None and sample.humidity_pct is None and sample.pressure_hpa is None:
+    if _thp_missing(sample):
         print(
             "Note: Temperature/humidity/pressure not ready within "
             f"{timeout_secs}s. Increase CHECK_TIMEOUT_SECS or verify wiring/address.",
@@ -5,7 +5,7 @@ import smbus2
 from bme680 import constants
 
 
-@dataclass
+@dataclass(slots=True)
 class BME680Sample:
     temperature_c: float | None
     humidity_pct: float | None
@@ -33,12 +33,13 @@ class BME680Reader:
             return BME680Sample(None, None, None, None, False)
 
         data = self._sensor.data
-        temp = float(data.temperature) if data.temperature is not None else None
-        hum = float(data.humidity) if data.humidity is not None else None
-        pres_hpa = float(data.pressure) if data.pressure is not None else None
+        # The driver already scales raw ADC values to floats; no re-boxing needed
+        temp = data.temperature
+        hum = data.humidity
+        pres_hpa = data.pressure
 
         gas_ok = bool(data.heat_stable)
-        gas_val = float(data.gas_resistance) if gas_ok and data.gas_resistance is not None else None
+        gas_val = data.gas_resistance if gas_ok else None
 
         return BME680Sample(
             temperature_c=temp,
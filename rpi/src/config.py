@@ -1,4 +1,5 @@
-import contextlib
+import functools
+import logging
 import os
 from enum import StrEnum
 from typing import Final
@@ -58,21 +59,27 @@ ENV_KEYS: Final[tuple[str, ...]] = (
 )
 
 
-def load_settings() -> Settings:
+@functools.cache
+def _dotenv_once() -> None:
     # Load .env if present (does nothing if file missing)
     load_dotenv()
+
+
+@functools.cache
+def load_settings() -> Settings:
+    _dotenv_once()
     # Load directly from environment; also picks up values from .env above
-    data: dict[str, str] = {}
-    for key in ENV_KEYS:
-        if key in os.environ:
-            data[key] = os.environ[key]
+    data: dict[str, str] = {k: os.environ[k] for k in ENV_KEYS if k in os.environ}
 
     # Handle hex I2C address if provided
     for key in ("I2C_ADDRESS", "BME680_I2C_ADDRESS", "VEML6030_I2C_ADDRESS"):
         if key in data:
             val = data[key]
-            with contextlib.suppress(Exception):
+            try:
                 data[key] = str(int(val, 0))
+            except ValueError as e:
+                # Leave the raw value in place; Settings validation reports it as an error
+                logging.warning("Invalid I2C address %s=%r: %s", key, val, e)
 
     try:
         settings = Settings.model_validate(data)
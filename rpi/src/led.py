@@ -1,3 +1,4 @@
+import contextlib
 import logging
 import os
 from typing import Final
@@ -29,31 +30,73 @@ class LedController:
         self._base = _LED_BASE
         self._available = os.path.isdir(self._base)
         self._warned_unavailable = False
+        # Set once the trigger file has been seen; cleared again after a failed write to force a re-probe
+        self._probed = False
+        self._trigger_path = self._path("trigger")
+        self._brightness_path = self._path("brightness")
+        self._delay_on_path = self._path("delay_on")
+        self._delay_off_path = self._path("delay_off")
+        # trigger/brightness are written every tick, so their descriptors stay open. delay_on/delay_off
+        # are recreated by the kernel whenever the trigger changes and must be reopened per write.
+        self._fds: dict[str, int] = {}
 
     def _path(self, name: str) -> str:
         return os.path.join(self._base, name)
 
     def _ensure_available(self) -> bool:
-        if self._available and os.path.exists(self._path("trigger")):
+        if self._probed:
+            return True
+        if self._available and os.path.exists(self._trigger_path):
+            self._probed = True
             return True
         if not self._warned_unavailable:
             logging.debug("PWR LED sysfs not available at %s", self._base)
             self._warned_unavailable = True
         return False
 
+    def _write_persistent(self, path: str, value: str) -> bool:
+        fd = self._fds.get(path)
+        try:
+            if fd is None:
+                fd = os.open(path, os.O_WRONLY)
+                self._fds[path] = fd
+            os.pwrite(fd, value.encode(), 0)
+            return True
+        except OSError as exc:
+            logging.debug("LED write failed: %s -> %s (%s)", path, value, exc)
+            if fd is not None:
+                self._close_fd(path)
+            return False
+
+    def _close_fd(self, path: str) -> None:
+        fd = self._fds.pop(path, None)
+        if fd is not None:
+            with contextlib.suppress(OSError):
+                os.close(fd)
+
+    def close(self) -> None:
+        """Release any sysfs descriptors held open between writes."""
+        for path in list(self._fds):
+            self._close_fd(path)
+
+    def _record(self, ok: bool) -> bool:
+        if not ok:
+            self._probed = False
+        return ok
+
     def off(self) -> bool:
         """Turn LED off. Returns True if writes succeeded."""
         if not self._ensure_available():
             return False
-        ok1 = _write_sysfs(self._path("trigger"), "none")
-        ok2 = _write_sysfs(self._path("brightness"), "0")
-        return bool(ok1 and ok2)
+        ok1 = self._write_persistent(self._trigger_path, "none")
+        ok2 = self._write_persistent(self._brightness_path, "0")
+        return self._record(ok1 and ok2)
 
     def blink(self) -> bool:
         """Enable kernel timer blinking with configured timings. Returns True if writes succeeded."""
         if not self._ensure_available():
             return False
-        ok1 = _write_sysfs(self._path("trigger"), "timer")
-        ok2 = _write_sysfs(self._path("delay_on"), str(self._blink_on_ms))
-        ok3 = _write_sysfs(self._path("delay_off"), str(self._blink_off_ms))
-        return bool(ok1 and ok2 and ok3)
+        ok1 = self._write_persistent(self._trigger_path, "timer")
+        ok2 = _write_sysfs(self._delay_on_path, str(self._blink_on_ms))
+        ok3 = _write_sysfs(self._delay_off_path, str(self._blink_off_ms))
+        return self._record(ok1 and ok2 and ok3)
@@ -30,21 +30,24 @@ def main() -> None:
         make_bme680_read_sample(bme_reader),
         make_veml6030_read_sample(veml_reader),
     )
-    run_publisher(
-        endpoint_url=settings.endpoint_url,
-        post_secret=settings.post_secret,
-        user_agent=settings.user_agent,
-        tick_seconds=settings.sample_interval_secs,
-        warmup_seconds=settings.warmup_duration_secs,
-        read_sample=read_sample,
-        spool_db_path=settings.spool_db_path,
-        spool_max_rows=settings.spool_max_rows,
-        spool_flush_batch=settings.spool_flush_batch,
-        on_send_success=lambda: led.off(),
-        on_send_failure=lambda _e: led.blink(),
-        on_flush_success=lambda flushed: (led.off() if flushed > 0 else None),
-        on_flush_error=lambda _e: led.blink(),
-    )
+    try:
+        run_publisher(
+            endpoint_url=settings.endpoint_url,
+            post_secret=settings.post_secret,
+            user_agent=settings.user_agent,
+            tick_seconds=settings.sample_interval_secs,
+            warmup_seconds=settings.warmup_duration_secs,
+            read_sample=read_sample,
+            spool_db_path=settings.spool_db_path,
+            spool_max_rows=settings.spool_max_rows,
+            spool_flush_batch=settings.spool_flush_batch,
+            on_send_success=lambda: led.off(),
+            on_send_failure=lambda _e: led.blink(),
+            on_flush_success=lambda flushed: (led.off() if flushed > 0 else None),
+            on_flush_error=lambda _e: led.blink(),
+        )
+    finally:
+        led.close()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,20 @@
 import contextlib
 import json
+import logging
 import sqlite3
+import threading
 import time
 from collections.abc import Callable
-from typing import Any
+from typing import Any, Final
+
+# SQL text is kept constant so sqlite3's per-connection statement cache reuses the prepared statements
+_SQL_INSERT: Final[str] = """
+    INSERT OR IGNORE INTO queue(deviceId, ts_min, payload_json, created_at)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_DEQUEUE: Final[str] = "SELECT id, payload_json FROM queue ORDER BY ts_min ASC, id ASC LIMIT ?"
+_SQL_DELETE: Final[str] = "DELETE FROM queue WHERE id = ?"
+_SQL_COUNT: Final[str] = "SELECT COUNT(1) FROM queue"
 
 
 class OfflineQueue:
@@ -13,11 +24,17 @@ class OfflineQueue:
     Oldest-first order: (ts_min, id)
     """
 
-    def __init__(self, db_path: str, max_rows: int) -> None:
+    def __init__(self, db_path: str, max_rows: int, checkpoint_interval_secs: float = 600.0) -> None:
         self.db_path = db_path
         self.max_rows = max_rows
         # check_same_thread=False because this may be called from different contexts in the future
         self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL + synchronous=NORMAL: commits append to the log instead of fsyncing the main DB (SD card wear)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        # Checkpoint from a background thread instead of letting an insert pay for it mid-tick
+        self._conn.execute("PRAGMA wal_autocheckpoint=0")
         self._conn.execute(
             """
             CREATE TABLE IF NOT EXISTS queue (
@@ -31,71 +48,95 @@ class OfflineQueue:
         )
         self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_queue_unique ON queue(deviceId, ts_min)")
         self._conn.execute("CREATE INDEX IF NOT EXISTS idx_queue_order ON queue(ts_min, id)")
+        # Enforce the row cap inside SQLite on every insert. TEMP keeps the trigger scoped to this connection,
+        # so the cap always matches this instance's max_rows instead of whatever an older run persisted.
+        # Triggers cannot take bound parameters, so the (int-coerced) cap is inlined.
+        cap = max(0, int(max_rows))
+        self._conn.execute(
+            f"""
+            CREATE TEMP TRIGGER IF NOT EXISTS trg_queue_row_cap AFTER INSERT ON main.queue
+            BEGIN
+                DELETE FROM queue WHERE id IN (
+                    SELECT id FROM queue ORDER BY ts_min DESC, id DESC LIMIT -1 OFFSET {cap}
+                );
+            END
+            """
+        )
         self._conn.commit()
 
+        self._stop_checkpoint = threading.Event()
+        self._checkpoint_thread = threading.Thread(
+            target=self._checkpoint_loop,
+            args=(max(1.0, float(checkpoint_interval_secs)),),
+            name="spool-wal-checkpoint",
+            daemon=True,
+        )
+        self._checkpoint_thread.start()
+
+    def _checkpoint_loop(self, interval: float) -> None:
+        # Separate connection: sqlite3 connections must not be shared across threads without locking
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while not self._stop_checkpoint.wait(interval):
+                try:
+                    # PASSIVE never blocks writers; anything it can't copy yet is picked up next round
+                    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                except sqlite3.Error as exc:
+                    logging.debug("WAL checkpoint failed: %s", exc)
+        finally:
+            conn.close()
+
     def close(self) -> None:
+        self._stop_checkpoint.set()
+        self._checkpoint_thread.join(timeout=5)
+        with contextlib.suppress(Exception):
+            # Let SQLite refresh planner stats for the indexes it actually used this session
+            self._conn.execute("PRAGMA optimize")
         with contextlib.suppress(Exception):
             self._conn.close()
 
-    def enqueue(self, payload: dict[str, Any]) -> None:
-        """Insert payload if not already present, then enforce row cap."""
+    @staticmethod
+    def _to_row(payload: dict[str, Any], now: int) -> tuple[str, int, str, int]:
         device_id = str(payload["deviceId"])  # required key
         ts_min = int(payload["ts_min"])  # required key
         payload_json = json.dumps(payload, separators=(",", ":"))
+        return device_id, ts_min, payload_json, now
+
+    def enqueue(self, payload: dict[str, Any]) -> None:
+        """Insert payload if not already present; the row-cap trigger prunes the oldest rows."""
+        self.batch_enqueue([payload])
+
+    def batch_enqueue(self, payloads: list[dict[str, Any]]) -> None:
+        """Insert payloads (skipping duplicates) in a single transaction; the trigger enforces the row cap."""
         now = int(time.time())
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            INSERT OR IGNORE INTO queue(deviceId, ts_min, payload_json, created_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (device_id, ts_min, payload_json, now),
-        )
-        self._conn.commit()
-        self.prune_to_row_cap(self.max_rows)
+        rows = [self._to_row(p, now) for p in payloads]
+        with self._conn:
+            self._conn.executemany(_SQL_INSERT, rows)
 
     def dequeue_batch(self, limit: int) -> list[tuple[int, dict[str, Any]]]:
         """Return up to limit oldest entries as (id, payload) tuples."""
-        cur = self._conn.cursor()
-        cur.execute(
-            "SELECT id, payload_json FROM queue ORDER BY ts_min ASC, id ASC LIMIT ?",
-            (int(limit),),
-        )
-        rows = cur.fetchall()
-        result: list[tuple[int, dict[str, Any]]] = []
-        for row in rows:
-            rid = int(row[0])
-            payload = json.loads(str(row[1]))
-            result.append((rid, payload))
-        return result
+        # id is INTEGER and payload_json is TEXT, so sqlite3 already yields int/str
+        return [(rid, json.loads(pj)) for rid, pj in self._conn.execute(_SQL_DEQUEUE, (int(limit),))]
 
     def delete(self, ids: list[int]) -> int:
         if not ids:
             return 0
-        placeholders = ",".join(["?"] * len(ids))
-        cur = self._conn.cursor()
-        cur.execute(f"DELETE FROM queue WHERE id IN ({placeholders})", [int(x) for x in ids])
-        self._conn.commit()
+        with self._conn:
+            cur = self._conn.executemany(_SQL_DELETE, [(int(x),) for x in ids])
         return int(cur.rowcount or 0)
 
     def count(self) -> int:
-        cur = self._conn.cursor()
-        cur.execute("SELECT COUNT(1) FROM queue")
-        row = cur.fetchone()
+        row = self._conn.execute(_SQL_COUNT).fetchone()
         return int(row[0]) if row else 0
 
     def prune_to_row_cap(self, max_rows: int) -> None:
         max_rows = max(0, int(max_rows))
-        total = self.count()
-        if total <= max_rows:
-            return
-        to_remove = total - max_rows
-        cur = self._conn.cursor()
-        cur.execute(
-            "DELETE FROM queue WHERE id IN (SELECT id FROM queue ORDER BY ts_min ASC, id ASC LIMIT ?)",
-            (to_remove,),
-        )
-        self._conn.commit()
+        # Everything past the newest max_rows rows is surplus; no separate COUNT needed
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM queue WHERE id IN (SELECT id FROM queue ORDER BY ts_min DESC, id DESC LIMIT -1 OFFSET ?)",
+                (max_rows,),
+            )
 
     def flush_once(self, max_batch: int, send_func: Callable[[dict[str, Any]], int]) -> int:
         """Attempt to send up to max_batch oldest items.
@@ -103,17 +144,18 @@ class OfflineQueue:
         Stops at first failure (exception or non-2xx). Returns number of flushed items.
         """
         batch = self.dequeue_batch(int(max_batch))
-        flushed = 0
+        ok_ids: list[int] = []
         for rid, payload in batch:
             try:
                 code = int(send_func(payload))
                 if 200 <= code < 300:
-                    self.delete([rid])
-                    flushed += 1
+                    ok_ids.append(rid)
                 else:
                     # Stop on first non-2xx to avoid busy looping when remote is down
                     break
             except Exception:
                 # Stop on first exception; assume network outage persists
                 break
-        return flushed
+        # Delete everything that was accepted in one commit
+        self.delete(ok_ids)
+        return len(ok_ids)
@@ -1,11 +1,12 @@
+import json
 import logging
 import socket
 import time
 from collections.abc import Callable
 
-from requests import Response, post
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
 
-from .models import EnvReadingModel
 from .offline_queue import OfflineQueue
 from .timeutil import day_from_epoch_minutes
 
@@ -21,13 +22,61 @@ def _get_device_id() -> str:
         return socket.gethostname()
 
 
-def _post_json(url: str, secret: str, user_agent: str, payload: dict[str, object]) -> int:
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": secret,
-        "User-Agent": user_agent,
-    }
-    resp: Response = post(url, json=payload, headers=headers, timeout=5)
+def _make_payload_builder(
+    device_id: str,
+) -> Callable[[int, str, dict[str, float | int | bool | None]], dict[str, object]]:
+    """Return a builder specialized for the fixed EnvReadingModel schema.
+
+    Values come from our own sensor readers, so the dict is built directly rather than paying for
+    pydantic validation + model_dump on every tick. None values are omitted, like exclude_none.
+    """
+
+    def build(ts_min: int, day: str, sample: dict[str, float | int | bool | None]) -> dict[str, object]:
+        payload: dict[str, object] = {"day": day, "ts_min": ts_min}
+        if (temp_c := sample.get("temperature_c")) is not None:
+            payload["temp_c"] = temp_c
+        if (humidity_pct := sample.get("humidity_pct")) is not None:
+            payload["humidity_pct"] = humidity_pct
+        if (pressure_hpa := sample.get("pressure_hpa")) is not None:
+            payload["pressure_hpa"] = pressure_hpa
+        if (ambient_lux := sample.get("ambient_lux")) is not None:
+            payload["ambient_lux"] = ambient_lux
+        payload["deviceId"] = device_id
+        return payload
+
+    return build
+
+
+def _sleep_until(deadline: float) -> float:
+    """Sleep until a monotonic deadline and return the next base; resync to now if we fell behind."""
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+        return deadline
+    return time.monotonic()
+
+
+def _make_session(secret: str, user_agent: str) -> Session:
+    """Build one keep-alive session so each tick reuses the TCP/TLS connection."""
+    session = Session()
+    # Retries are handled by the offline queue, not by urllib3
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "Content-Type": "application/json",
+            "Authorization": secret,
+            "User-Agent": user_agent,
+        }
+    )
+    return session
+
+
+def _post_json(session: Session, url: str, payload: dict[str, object]) -> int:
+    # Pre-encode compactly; the session's Content-Type header already marks it as JSON
+    body = json.dumps(payload, separators=(",", ":"))
+    resp: Response = session.post(url, data=body, timeout=5)
     return int(resp.status_code)
 
 
@@ -58,91 +107,87 @@ def run_publisher(
         time.sleep(int(warmup_seconds))
         logging.info("Warmup complete; starting sampling every %ss", tick)
 
-    device_id = _get_device_id()
+    build_payload = _make_payload_builder(_get_device_id())
     queue = OfflineQueue(db_path=spool_db_path, max_rows=spool_max_rows)
+    session = _make_session(post_secret, user_agent)
 
     def _send_once(payload: dict[str, object]) -> int:
-        return _post_json(endpoint_url, post_secret, user_agent, payload)
-
-    first_sent = False
-    while True:
-        sample = read_sample()
-
-        ts_sec = int(time.time())
-        ts_min = ts_sec // 60
-        day = day_from_epoch_minutes(ts_min)
-
-        model = EnvReadingModel(
-            day=day,
-            ts_min=ts_min,
-            temp_c=sample.get("temperature_c"),
-            humidity_pct=sample.get("humidity_pct"),
-            pressure_hpa=sample.get("pressure_hpa"),
-            ambient_lux=sample.get("ambient_lux"),
-            iaq=None,
-            noise_db=None,
-            deviceId=device_id,
-        )
-
-        payload = model.model_dump(exclude_none=True)
-
-        # First, attempt to flush previously queued payloads
-        try:
-            flushed = queue.flush_once(max_batch=spool_flush_batch, send_func=_send_once)
-            if flushed > 0:
-                logging.info("Flushed %s queued samples", flushed)
-            if on_flush_success is not None:
-                try:
-                    on_flush_success(flushed)
-                except Exception:
-                    # Callback errors must not affect the loop
-                    logging.debug("on_flush_success callback error", exc_info=True)
-        except Exception as exc:
-            # Flushing failure is non-fatal; we will try again next tick
-            logging.debug("Flush attempt failed: %s", exc)
-            if on_flush_error is not None:
+        return _post_json(session, endpoint_url, payload)
+
+    try:
+        first_sent = False
+        # Schedule against fixed deadlines so read/send time doesn't stretch the sampling period
+        next_tick = time.monotonic()
+        while True:
+            sample = read_sample()
+
+            ts_sec = int(time.time())
+            ts_min = ts_sec // 60
+            day = day_from_epoch_minutes(ts_min)
+
+            payload = build_payload(ts_min, day, sample)
+
+            # First, attempt to flush previously queued payloads
+            try:
+                flushed = queue.flush_once(max_batch=spool_flush_batch, send_func=_send_once)
+                if flushed > 0:
+                    logging.info("Flushed %s queued samples", flushed)
+                if on_flush_success is not None:
+                    try:
+                        on_flush_success(flushed)
+                    except Exception:
+                        # Callback errors must not affect the loop
+                        logging.debug("on_flush_success callback error", exc_info=True)
+            except Exception as exc:
+                # Flushing failure is non-fatal; we will try again next tick
+                logging.debug("Flush attempt failed: %s", exc)
+                if on_flush_error is not None:
+                    try:
+                        on_flush_error(exc)
+                    except Exception:
+                        logging.debug("on_flush_error callback error", exc_info=True)
+
+            # Now send current payload; on failure, enqueue it for later
+            try:
+                logging.debug("Sending sample: %s", payload)
+                code = _send_once(payload)
+                if not (200 <= code < 300):
+                    raise RuntimeError(f"HTTP status {code}")
+            except SystemExit:
+                # Preserve test behavior that uses SystemExit to stop the loop
+                raise
+            except Exception as exc:
+                logging.warning("Send failed; enqueuing for retry: %s", exc)
+                if on_send_failure is not None:
+                    try:
+                        on_send_failure(exc)
+                    except Exception:
+                        logging.debug("on_send_failure callback error", exc_info=True)
                 try:
-                    on_flush_error(exc)
-                except Exception:
-                    logging.debug("on_flush_error callback error", exc_info=True)
-
-        # Now send current payload; on failure, enqueue it for later
-        try:
-            logging.info("Sending sample: %s", payload)
-            code = _send_once(payload)
-            if not (200 <= code < 300):
-                raise RuntimeError(f"HTTP status {code}")
-        except SystemExit:
-            # Preserve test behavior that uses SystemExit to stop the loop
-            raise
-        except Exception as exc:
-            logging.warning("Send failed; enqueuing for retry: %s", exc)
-            if on_send_failure is not None:
+                    queue.enqueue(payload)
+                except Exception as qexc:
+                    logging.error("Failed to enqueue payload for retry: %s", qexc)
+                else:
+                    logging.info("Queued sample for later retry: ts_min=%s", ts_min)
+                # Skip first_sent logging on failure
+                next_tick = _sleep_until(next_tick + tick)
+                continue
+            if not first_sent:
+                logging.info(
+                    "First sample sent: temp=%sC hum=%s%% pres=%shPa",
+                    payload.get("temp_c"),
+                    payload.get("humidity_pct"),
+                    payload.get("pressure_hpa"),
+                )
+                first_sent = True
+            if on_send_success is not None:
                 try:
-                    on_send_failure(exc)
+                    on_send_success()
                 except Exception:
-                    logging.debug("on_send_failure callback error", exc_info=True)
-            try:
-                queue.enqueue(payload)
-            except Exception as qexc:
-                logging.error("Failed to enqueue payload for retry: %s", qexc)
-            else:
-                logging.info("Queued sample for later retry: ts_min=%s", ts_min)
-            # Skip first_sent logging on failure
-            time.sleep(tick)
-            continue
-        if not first_sent:
-            logging.info(
-                "First sample sent: temp=%sC hum=%s%% pres=%shPa",
-                model.temp_c,
-                model.humidity_pct,
-                model.pressure_hpa,
-            )
-            first_sent = True
-        if on_send_success is not None:
-            try:
-                on_send_success()
-            except Exception:
-                logging.debug("on_send_success callback error", exc_info=True)
+                    logging.debug("on_send_success callback error", exc_info=True)
 
-        time.sleep(tick)
+            next_tick = _sleep_until(next_tick + tick)
+    finally:
+        # Stops the WAL checkpoint thread and runs PRAGMA optimize before closing the spool
+        queue.close()
+        session.close()
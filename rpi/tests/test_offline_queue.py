@@ -54,3 +54,16 @@ def test_flush_once_stops_on_failure_and_deletes_success(tmp_path) -> None:  # t
     flushed2 = q.flush_once(max_batch=10, send_func=lambda _p: 201)
     assert flushed2 == 1
     assert q.count() == 0
+
+
+def test_batch_enqueue_dedupes_and_prunes(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    db_path = tmp_path / "spool.db"
+    q = OfflineQueue(str(db_path), max_rows=3)
+
+    # Duplicate (dev1, 300) within the batch is ignored; cap keeps the newest 3
+    q.batch_enqueue([_make_payload("dev1", 300 + i) for i in (0, 0, 1, 2, 3)])
+
+    assert q.count() == 3
+    assert [p[1]["ts_min"] for p in q.dequeue_batch(10)] == [301, 302, 303]
+    assert q.delete([rid for rid, _ in q.dequeue_batch(2)]) == 2
+    assert q.count() == 1
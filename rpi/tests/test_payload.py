@@ -1,8 +1,10 @@
 from typing import Any
 
 import pytest
+from requests import Session
 
 from src.config import Settings
+from src.models import EnvReadingModel
 from src.publisher import run_publisher
 from src.timeutil import day_from_epoch_minutes
 
@@ -19,7 +21,7 @@ def test_payload_matches_env_reading_model(monkeypatch: pytest.MonkeyPatch) -> N
 
     captured: dict[str, Any] | None = None
 
-    def fake_post(url: str, secret: str, ua: str, payload: dict[str, Any]) -> int:  # noqa: ARG001
+    def fake_post(session: Session, url: str, payload: dict[str, Any]) -> int:  # noqa: ARG001
         nonlocal captured
         captured = payload
         raise SystemExit  # stop the loop after first send
@@ -51,3 +53,5 @@ def test_payload_matches_env_reading_model(monkeypatch: pytest.MonkeyPatch) -> N
     assert captured["temp_c"] == 22.5
     assert captured["humidity_pct"] == 40.0
     assert captured["pressure_hpa"] == 1007.3
+    # Payload is built without pydantic; it must still round-trip through the schema unchanged
+    assert EnvReadingModel.model_validate(captured).model_dump(exclude_none=True) == captured
@@ -1,15 +1,20 @@
-from datetime import date as date_cls, datetime, time, timezone, timedelta
-from typing import List
+from datetime import date as date_cls, datetime, timezone, timedelta, tzinfo
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
 
 import plotly.graph_objects as go
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
 
 from src.auth import login, logout
 from src.data import (
+    SLEEP_STAGES,
     fetch_env_readings,
-    fetch_env_readings_days,
     fetch_sleep_segments,
     fetch_sleep_summary,
 )
@@ -35,114 +40,85 @@ def _percentile_label(p: Percentile) -> str:
     return mapping[p]
 
 
-@st.cache_data(show_spinner=False)
-def _load_day(day_str: str):
-    return fetch_env_readings(day_str)
-
+def _to_local(ts_sec: int, tz: tzinfo) -> datetime:
+    return datetime.fromtimestamp(int(ts_sec), tz=tz)
 
-@st.cache_data(show_spinner=False)
-def _load_sleep_segments_cached(day_str: str):
-    return fetch_sleep_segments(day_str)
 
+def _to_local_series(ts_sec: pd.Series, tz: tzinfo) -> pd.Series:
+    """Vectorized epoch-seconds -> tz-aware datetimes; use instead of per-row _to_local."""
+    return pd.to_datetime(ts_sec, unit="s", utc=True).dt.tz_convert(tz)
 
-@st.cache_data(show_spinner=False)
-def _load_sleep_summary_cached(day_str: str):
-    return fetch_sleep_summary(day_str)
-
-
-def main() -> None:
-    load_dotenv()
-    st.set_page_config(page_title="Sleep QA - Environment Dashboard", layout="wide")
 
-    # Authentication check - show login if not authenticated
-    if not st.session_state.get("authenticated", False):
-        login()
-        return
-
-    # Add logout button in sidebar
-    with st.sidebar:
-        st.write(f"👤 Logged in as: {st.session_state.get('username', 'admin')}")
-        if st.button("🚪 Logout"):
-            logout()
-
-    st.title("Environment Dashboard")
-
-    # Time window controls (local timezone)
-    local_tz = datetime.now().astimezone().tzinfo
-    local_now = datetime.now(tz=local_tz)
-    if "window_end" not in st.session_state:
-        st.session_state.window_end = local_now
-    col_a, col_b, col_c = st.columns(3)
-    with col_a:
-        if st.button("◀ Previous 24h"):
-            st.session_state.window_end = st.session_state.window_end - timedelta(hours=24)
-    with col_b:
-        if st.button("Now"):
-            st.session_state.window_end = local_now
-    with col_c:
-        disable_next = (st.session_state.window_end + timedelta(hours=24)) > local_now
-        if st.button("Next 24h ▶", disabled=disable_next):
-            st.session_state.window_end = min(st.session_state.window_end + timedelta(hours=24), local_now)
+# Past UTC days only change when a sensor flushes its offline spool, so they can be cached far longer
+# than today's partition, which grows every minute.
+@st.cache_data(show_spinner=False, ttl=timedelta(hours=6), max_entries=64)
+def _load_day_historical(day_str: str):
+    return fetch_env_readings(day_str)
 
-    # Never allow moving the window past 'now'
-    if st.session_state.window_end > local_now:
-        st.session_state.window_end = local_now
-    window_end_local = st.session_state.window_end
-    window_start_local = window_end_local - timedelta(hours=24)
 
-    bucket_choice = st.radio(
-        "Bucket size",
-        options=[BucketSize.FIVE_MINUTES, BucketSize.ONE_HOUR],
-        format_func=_bucket_label,
-        horizontal=True,
-    )
+@st.cache_data(show_spinner=False, ttl=timedelta(seconds=60))
+def _load_day_today(day_str: str):
+    return fetch_env_readings(day_str)
 
-    pct_options: List[Percentile] = [Percentile.P50, Percentile.P90, Percentile.P99, Percentile.MAX]
-    selected_pcts = st.multiselect(
-        "Percentiles to show (Average always shown)",
-        options=pct_options,
-        default=[Percentile.P50],
-        format_func=_percentile_label,
-    )
 
-    # Determine which UTC day partitions to read
-    start_utc = window_start_local.astimezone(timezone.utc)
-    end_utc = window_end_local.astimezone(timezone.utc)
-    day_list: List[str] = []
-    cur_date = start_utc.date()
-    end_date = end_utc.date()
-    while True:
-        day_list.append(cur_date.strftime("%Y-%m-%d"))
-        if cur_date == end_date:
-            break
-        cur_date = (datetime.combine(cur_date, time.min, tzinfo=timezone.utc) + timedelta(days=1)).date()
+def _load_day(day_str: str):
+    today_utc = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d")
+    return _load_day_historical(day_str) if day_str < today_utc else _load_day_today(day_str)
+
+
+def _load_window(days: tuple[str, ...]) -> pd.DataFrame:
+    """Load the UTC day partitions covering a window, sorted by ``ts_min``.
+
+    Each partition is cached on its own so historical days keep their long TTL when today's expires.
+    """
+    if len(days) == 1:
+        return _load_day(days[0])
+    # Partitions are independent I/O-bound queries, so cache misses are fetched concurrently.
+    # Workers inherit this session's script context so st.cache_data lookups behave as on the main thread
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=min(8, len(days)),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+    ) as pool:
+        frames = list(pool.map(_load_day, days))
+    # Partitions cover disjoint, ascending ts_min ranges, so date order is already sorted
+    return pd.concat(frames, ignore_index=True)
+
+
+@st.cache_data(show_spinner=False, ttl=timedelta(hours=1))
+def _load_sleep_day(day_str: str) -> tuple[pd.DataFrame, dict[str, Any] | None]:
+    """Load a sleep date's segments and summary row together under one cache entry."""
+    seg_df = fetch_sleep_segments(day_str)
     try:
-        if len(day_list) == 1:
-            df = _load_day(day_list[0])
-        else:
-            df = fetch_env_readings_days(day_list)
-    except Exception as exc:  # surface helpful errors (e.g., table not found)
-        st.error(str(exc))
-        return
-
-    if df is None or df.empty:
-        st.info("No data for the selected window.")
-        return
+        summary_row = fetch_sleep_summary(day_str)
+    except Exception:
+        # Summary is optional; keep the segments rather than losing the whole day
+        summary_row = None
+    return seg_df, summary_row
 
-    # Filter DF to local-time window
-    ts_local = pd.to_datetime(df["ts_min"] * 60, unit="s", utc=True).dt.tz_convert(local_tz)
-    mask = (ts_local >= window_start_local) & (ts_local <= window_end_local)
-    df = df.loc[mask].reset_index(drop=True)
-
-    agg = aggregate_buckets(df, bucket_choice, local_tz)
-    summary = summarize_timeframe(df)
 
+def _safe_load(loader: Callable[[str], Any], day_str: str) -> Any:
+    """Run a per-day loader, treating failures as missing data (overlay is best-effort)."""
+    try:
+        return loader(day_str)
+    except Exception:
+        return None
+
+
+@st.fragment
+def _env_chart(
+    agg: pd.DataFrame,
+    summary: dict[str, dict[str, float | None]],
+    selected_pcts: List[Percentile],
+    day_list: List[str],
+    window_start_local: datetime,
+    window_end_local: datetime,
+    local_tz: tzinfo,
+) -> None:
+    """Environment chart with the optional sleep-stage overlay; toggling the overlay reruns only this fragment."""
     # X-axis as local datetimes
     x_vals = agg["bucket_time"]
 
-    # Label above the chart to avoid legend/title overlap
-    st.caption(f"Last 24 hours ending {window_end_local.strftime('%Y-%m-%d %H:%M %Z')} — {_bucket_label(bucket_choice)}")
-
     # Prepare figure
     fig = go.Figure()
 
@@ -189,11 +165,10 @@ def main() -> None:
         maybe_add("humidity_max", "Humidity Max (%)", "#7f7f7f", "y2")
 
     # Initial ranges: 24h on x; keep y ranges reasonable
-    temp_vals = df["temp_c"].dropna()
-    if not temp_vals.empty:
-        t_min = float(temp_vals.min())
-        t_max = float(temp_vals.max())
-    else:
+    # summarize_timeframe already ran nanmin/nanmax over temp_c; reuse it instead of another dropna pass
+    t_min = summary["temperature"]["min"]
+    t_max = summary["temperature"]["max"]
+    if t_min is None or t_max is None or math.isnan(t_min):
         t_min, t_max = 0.0, 40.0
     pad = 1.0
     y1_range = [max(-10.0, t_min - pad), min(50.0, t_max + pad)]
@@ -202,70 +177,80 @@ def main() -> None:
     show_overlay = st.checkbox("Overlay sleep stages", value=False)
     if show_overlay:
         stage_colors = {"Deep": "#1f77b4", "Light": "#ff7f0e", "REM": "#2ca02c", "Awake": "#d62728"}
-        added_proxy: set[str] = set()
-
-        def _to_local(ts_sec: int) -> datetime:
-            return datetime.fromtimestamp(int(ts_sec), tz=timezone.utc).astimezone(local_tz)
-
-        # Load segments for all UTC days in the window
-        seg_frames: list[pd.DataFrame] = []
-        for d in day_list:
-            try:
-                df_seg = _load_sleep_segments_cached(d)
-                if df_seg is not None and not df_seg.empty:
-                    seg_frames.append(df_seg)
-            except Exception:
-                pass
+
+        # Load segments and summaries for all UTC days in the window concurrently
+        # Workers inherit this session's script context so st.cache_data lookups behave as on the main thread
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(
+            max_workers=min(8, len(day_list)),
+            initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+        ) as pool:
+            sleep_days = list(pool.map(lambda d: _safe_load(_load_sleep_day, d) or (None, None), day_list))
+        seg_results = [seg for seg, _ in sleep_days]
+        sum_results = [ssum for _, ssum in sleep_days]
+        seg_frames: list[pd.DataFrame] = [df_seg for df_seg in seg_results if df_seg is not None and not df_seg.empty]
         seg_all = pd.concat(seg_frames, ignore_index=True) if seg_frames else None
 
+        # Stage bands and bedtime/risetime lines are collected as plain dicts and assigned in one
+        # update_layout; each add_vrect/add_vline call would re-validate the whole shapes tuple.
+        shapes: list[dict[str, Any]] = []
         if seg_all is not None and not seg_all.empty:
-            for _, r in seg_all.iterrows():
-                stage_name = str(r.get("stage"))
-                x0 = _to_local(r.get("start_ts"))
-                x1 = _to_local(r.get("end_ts"))
-                # Clip to window
-                x0c = x0 if x0 > window_start_local else window_start_local
-                x1c = x1 if x1 < window_end_local else window_end_local
-                if x0c >= x1c:
-                    continue
-                fig.add_vrect(
-                    x0=x0c,
-                    x1=x1c,
+            # Convert and clip all segments at once
+            seg_start = _to_local_series(seg_all["start_ts"], local_tz)
+            seg_end = _to_local_series(seg_all["end_ts"], local_tz)
+            x0c = seg_start.clip(lower=window_start_local)
+            x1c = seg_end.clip(upper=window_end_local)
+            keep = (x0c < x1c).to_numpy()
+            stages = seg_all["stage"].astype(str).to_numpy()[keep]
+            shapes.extend(
+                dict(
+                    type="rect",
+                    xref="x",
+                    yref="y domain",
+                    x0=x0,
+                    x1=x1,
                     y0=0,
                     y1=1,
-                    yref="y",
                     fillcolor=stage_colors.get(stage_name, "#cccccc"),
                     opacity=0.15,
                     line_width=0,
                     layer="below",
                 )
-                if stage_name not in added_proxy:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[None],
-                            y=[None],
-                            mode="lines",
-                            line=dict(color=stage_colors.get(stage_name, "#cccccc"), width=10),
-                            name=stage_name,
-                            showlegend=True,
-                        )
+                for x0, x1, stage_name in zip(x0c[keep], x1c[keep], stages)
+            )
+            for stage_name in pd.unique(stages):
+                fig.add_trace(
+                    go.Scatter(
+                        x=[None],
+                        y=[None],
+                        mode="lines",
+                        line=dict(color=stage_colors.get(stage_name, "#cccccc"), width=10),
+                        name=stage_name,
+                        showlegend=True,
                     )
-                    added_proxy.add(stage_name)
+                )
 
         # Bedtime/risetime markers if available in summaries for days in range
-        for d in day_list:
-            try:
-                ssum = _load_sleep_summary_cached(d)
-            except Exception:
-                ssum = None
+        for ssum in sum_results:
             if not ssum:
                 continue
-            bt = ssum.get("bedtime")
-            rt = ssum.get("risetime")
-            if isinstance(bt, int):
-                fig.add_vline(x=_to_local(bt), line_dash="dash", line_color="#999", opacity=0.6)
-            if isinstance(rt, int):
-                fig.add_vline(x=_to_local(rt), line_dash="dash", line_color="#999", opacity=0.6)
+            for marker in (ssum.get("bedtime"), ssum.get("risetime")):
+                if isinstance(marker, int):
+                    x = _to_local(marker, local_tz)
+                    shapes.append(
+                        dict(
+                            type="line",
+                            xref="x",
+                            yref="y domain",
+                            x0=x,
+                            x1=x,
+                            y0=0,
+                            y1=1,
+                            line=dict(dash="dash", color="#999"),
+                            opacity=0.6,
+                        )
+                    )
+        fig.update_layout(shapes=shapes)
 
     fig.update_layout(
         xaxis=dict(title="Time", range=[window_start_local, window_end_local], rangeslider=dict(visible=False), fixedrange=True),
@@ -293,16 +278,10 @@ def main() -> None:
         },
     )
 
-    # Summary panel
-    st.subheader("Summary (selected timeframe)")
-    c1, c2, c3, c4, c5, c6 = st.columns(6)
-    c1.metric("Temp Min (°C)", f"{summary['temperature']['min']:.2f}" if summary["temperature"]["min"] is not None else "—")
-    c2.metric("Temp Max (°C)", f"{summary['temperature']['max']:.2f}" if summary["temperature"]["max"] is not None else "—")
-    c3.metric("Temp Std (°C)", f"{summary['temperature']['std']:.2f}" if summary["temperature"]["std"] is not None else "—")
-    c4.metric("Hum Min (%)", f"{summary['humidity']['min']:.2f}" if summary["humidity"]["min"] is not None else "—")
-    c5.metric("Hum Max (%)", f"{summary['humidity']['max']:.2f}" if summary["humidity"]["max"] is not None else "—")
-    c6.metric("Hum Std (%)", f"{summary['humidity']['std']:.2f}" if summary["humidity"]["std"] is not None else "—")
 
+@st.fragment
+def _sleep_section(local_now: datetime, local_tz: tzinfo, window_start_local: datetime, window_end_local: datetime) -> None:
+    """Sleep session KPIs and hypnogram; changing the sleep date reruns only this fragment."""
     # Sleep session section
     st.header("Sleep Session")
     default_sleep_date = (local_now - timedelta(days=1)).date()
@@ -310,8 +289,7 @@ def main() -> None:
     sleep_date_str = sleep_date.strftime("%Y-%m-%d") if hasattr(sleep_date, "strftime") else str(sleep_date)
 
     try:
-        seg_df = _load_sleep_segments_cached(sleep_date_str)
-        summary_row = _load_sleep_summary_cached(sleep_date_str)
+        seg_df, summary_row = _load_sleep_day(sleep_date_str)
     except Exception as exc:
         st.error(str(exc))
         return
@@ -333,11 +311,11 @@ def main() -> None:
         k2.metric("Efficiency", f"{eff_val:.0%}" if isinstance(eff_val, float) else "—")
         k3.metric("Total (h)", f"{total_hours:.2f}")
         if isinstance(bedtime, int):
-            k4.metric("Bedtime", datetime.fromtimestamp(bedtime, tz=timezone.utc).astimezone(local_tz).strftime("%H:%M"))
+            k4.metric("Bedtime", _to_local(bedtime, local_tz).strftime("%H:%M"))
         else:
             k4.metric("Bedtime", "—")
         if isinstance(risetime, int):
-            k5.metric("Risetime", datetime.fromtimestamp(risetime, tz=timezone.utc).astimezone(local_tz).strftime("%H:%M"))
+            k5.metric("Risetime", _to_local(risetime, local_tz).strftime("%H:%M"))
         else:
             k5.metric("Risetime", "—")
 
@@ -365,22 +343,24 @@ def main() -> None:
     else:
         # Derive minimal KPIs from segments if summary is unavailable
         if seg_df is not None and not seg_df.empty:
-            total_seconds_asleep = int(seg_df.loc[seg_df["stage"].isin(["Deep", "Light", "REM"]), "duration_s"].sum())
+            # One pass over the segments for every per-stage total used below
+            stage_totals = seg_df.groupby("stage", sort=False, observed=True)["duration_s"].sum()
+            deep_s = int(stage_totals.get("Deep", 0))
+            light_s = int(stage_totals.get("Light", 0))
+            rem_s = int(stage_totals.get("REM", 0))
+            total_s = int(stage_totals.sum())
+            total_seconds_asleep = deep_s + light_s + rem_s
             total_hours = total_seconds_asleep / 3600.0
             st_min = int(seg_df["start_ts"].min())
             en_max = int(seg_df["end_ts"].max())
             k1.metric("Sleep Score", "—")
             k2.metric("Efficiency", "—")
             k3.metric("Total (h)", f"{total_hours:.2f}")
-            k4.metric("Bedtime", datetime.fromtimestamp(st_min, tz=timezone.utc).astimezone(local_tz).strftime("%H:%M"))
-            k5.metric("Risetime", datetime.fromtimestamp(en_max, tz=timezone.utc).astimezone(local_tz).strftime("%H:%M"))
+            k4.metric("Bedtime", _to_local(st_min, local_tz).strftime("%H:%M"))
+            k5.metric("Risetime", _to_local(en_max, local_tz).strftime("%H:%M"))
 
             st.subheader("Stage Composition")
             stage_labels = ["Deep", "Light", "REM", "Awake"]
-            deep_s = int(seg_df.loc[seg_df["stage"] == "Deep", "duration_s"].sum())
-            light_s = int(seg_df.loc[seg_df["stage"] == "Light", "duration_s"].sum())
-            rem_s = int(seg_df.loc[seg_df["stage"] == "REM", "duration_s"].sum())
-            total_s = int(seg_df["duration_s"].sum())
             awake_s = max(total_s - (deep_s + light_s + rem_s), 0)
             pie_fig = go.Figure(
                 data=[
@@ -398,36 +378,37 @@ def main() -> None:
     # Hypnogram
     if seg_df is not None and not seg_df.empty:
         st.subheader("Hypnogram")
-        # Stage ordering and colors
-        stage_order = {"Deep": 0, "Light": 1, "REM": 2, "Awake": 3}
-        stage_colors = {"Deep": "#1f77b4", "Light": "#ff7f0e", "REM": "#2ca02c", "Awake": "#d62728"}
-
-        def _to_local(ts: int) -> datetime:
-            return datetime.fromtimestamp(int(ts), tz=timezone.utc).astimezone(local_tz)
+        # Colors indexed by stage code; the categorical codes follow SLEEP_STAGES and are the y-values
+        stage_colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"]
+
+        # One vectorized tz conversion for all segments; per-stage traces are then sliced out by mask
+        starts = _to_local_series(seg_df["start_ts"], local_tz).to_numpy(dtype=object)
+        ends = _to_local_series(seg_df["end_ts"], local_tz).to_numpy(dtype=object)
+        # Unknown stages are -1
+        stage_codes = seg_df["stage"].cat.codes.to_numpy()
+        known = stage_codes >= 0
+        x_min = starts[known].min() if known.any() else None
+        x_max = ends[known].max() if known.any() else None
 
         hyp_fig = go.Figure()
-        x_min = None
-        x_max = None
-        for stage_name, idx in stage_order.items():
-            times: list[datetime | None] = []
-            vals: list[int | None] = []
-            for _, row in seg_df.iterrows():
-                if row.get("stage") != stage_name:
-                    continue
-                s = _to_local(row.get("start_ts"))
-                e = _to_local(row.get("end_ts"))
-                x_min = s if x_min is None or s < x_min else x_min
-                x_max = e if x_max is None or e > x_max else x_max
-                times.extend([s, e, None])
-                vals.extend([idx, idx, None])
-            if times:
+        for idx, stage_name in enumerate(SLEEP_STAGES):
+            m = stage_codes == idx
+            n = int(m.sum())
+            if n:
+                # Each segment is drawn as start -> end followed by a None gap
+                times = np.empty(3 * n, dtype=object)
+                times[0::3] = starts[m]
+                times[1::3] = ends[m]
+                vals = np.empty(3 * n, dtype=object)
+                vals[0::3] = idx
+                vals[1::3] = idx
                 hyp_fig.add_trace(
                     go.Scatter(
                         x=times,
                         y=vals,
                         mode="lines",
                         name=stage_name,
-                        line=dict(color=stage_colors[stage_name], width=8),
+                        line=dict(color=stage_colors[idx], width=8),
                         line_shape="hv",
                         hoverinfo="x+name",
                     )
@@ -435,8 +416,8 @@ def main() -> None:
 
         # Set x-range to sleep window if available, else from segments
         if summary_row and isinstance(summary_row.get("bedtime"), int) and isinstance(summary_row.get("risetime"), int):
-            x0 = _to_local(summary_row.get("bedtime"))
-            x1 = _to_local(summary_row.get("risetime"))
+            x0 = _to_local(summary_row.get("bedtime"), local_tz)
+            x1 = _to_local(summary_row.get("risetime"), local_tz)
         else:
             x0 = x_min or window_start_local
             x1 = x_max or window_end_local
@@ -446,8 +427,8 @@ def main() -> None:
             yaxis=dict(
                 title="Stage",
                 tickmode="array",
-                tickvals=[0, 1, 2, 3],
-                ticktext=["Deep", "Light", "REM", "Awake"],
+                tickvals=list(range(len(SLEEP_STAGES))),
+                ticktext=SLEEP_STAGES,
                 autorange="reversed",
                 fixedrange=True,
             ),
@@ -473,6 +454,104 @@ def main() -> None:
         )
 
 
+def main() -> None:
+    load_dotenv()
+    st.set_page_config(page_title="Sleep QA - Environment Dashboard", layout="wide")
+
+    # Authentication check - show login if not authenticated
+    if not st.session_state.get("authenticated", False):
+        login()
+        return
+
+    # Add logout button in sidebar
+    with st.sidebar:
+        st.write(f"👤 Logged in as: {st.session_state.get('username', 'admin')}")
+        if st.button("🚪 Logout"):
+            logout()
+
+    st.title("Environment Dashboard")
+
+    # Time window controls (local timezone)
+    local_tz = datetime.now().astimezone().tzinfo
+    local_now = datetime.now(tz=local_tz)
+    if "window_end" not in st.session_state:
+        st.session_state.window_end = local_now
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        if st.button("◀ Previous 24h"):
+            st.session_state.window_end = st.session_state.window_end - timedelta(hours=24)
+    with col_b:
+        if st.button("Now"):
+            st.session_state.window_end = local_now
+    with col_c:
+        disable_next = (st.session_state.window_end + timedelta(hours=24)) > local_now
+        if st.button("Next 24h ▶", disabled=disable_next):
+            st.session_state.window_end = min(st.session_state.window_end + timedelta(hours=24), local_now)
+
+    # Never allow moving the window past 'now'
+    if st.session_state.window_end > local_now:
+        st.session_state.window_end = local_now
+    window_end_local = st.session_state.window_end
+    window_start_local = window_end_local - timedelta(hours=24)
+
+    bucket_choice = st.radio(
+        "Bucket size",
+        options=[BucketSize.FIVE_MINUTES, BucketSize.ONE_HOUR],
+        format_func=_bucket_label,
+        horizontal=True,
+    )
+
+    pct_options: List[Percentile] = [Percentile.P50, Percentile.P90, Percentile.P99, Percentile.MAX]
+    selected_pcts = st.multiselect(
+        "Percentiles to show (Average always shown)",
+        options=pct_options,
+        default=[Percentile.P50],
+        format_func=_percentile_label,
+    )
+
+    # Determine which UTC day partitions to read
+    start_utc = window_start_local.astimezone(timezone.utc)
+    end_utc = window_end_local.astimezone(timezone.utc)
+    day_list: List[str] = pd.date_range(start_utc.date(), end_utc.date(), freq="D").strftime("%Y-%m-%d").tolist()
+    try:
+        df = _load_window(tuple(day_list))
+    except Exception as exc:  # surface helpful errors (e.g., table not found)
+        st.error(str(exc))
+        return
+
+    if df is None or df.empty:
+        st.info("No data for the selected window.")
+        return
+
+    # Filter DF to the window on the sorted integer minutes; bounds match comparing ts_min*60 to the window
+    start_min = math.ceil(window_start_local.timestamp() / 60)
+    end_min = math.floor(window_end_local.timestamp() / 60)
+    ts_min = df["ts_min"].to_numpy()
+    lo = int(np.searchsorted(ts_min, start_min, side="left"))
+    hi = int(np.searchsorted(ts_min, end_min, side="right"))
+    df = df.iloc[lo:hi]
+
+    agg = aggregate_buckets(df, bucket_choice, local_tz)
+    summary = summarize_timeframe(df)
+
+    # Label above the chart to avoid legend/title overlap
+    st.caption(f"Last 24 hours ending {window_end_local.strftime('%Y-%m-%d %H:%M %Z')} — {_bucket_label(bucket_choice)}")
+
+    _env_chart(agg, summary, selected_pcts, day_list, window_start_local, window_end_local, local_tz)
+
+    # Summary panel
+    st.subheader("Summary (selected timeframe)")
+    c1, c2, c3, c4, c5, c6 = st.columns(6)
+    c1.metric("Temp Min (°C)", f"{summary['temperature']['min']:.2f}" if summary["temperature"]["min"] is not None else "—")
+    c2.metric("Temp Max (°C)", f"{summary['temperature']['max']:.2f}" if summary["temperature"]["max"] is not None else "—")
+    c3.metric("Temp Std (°C)", f"{summary['temperature']['std']:.2f}" if summary["temperature"]["std"] is not None else "—")
+    c4.metric("Hum Min (%)", f"{summary['humidity']['min']:.2f}" if summary["humidity"]["min"] is not None else "—")
+    c5.metric("Hum Max (%)", f"{summary['humidity']['max']:.2f}" if summary["humidity"]["max"] is not None else "—")
+    c6.metric("Hum Std (%)", f"{summary['humidity']['std']:.2f}" if summary["humidity"]["std"] is not None else "—")
+
+    _sleep_section(local_now, local_tz, window_start_local, window_end_local)
+
+
 if __name__ == "__main__":
     main()
 
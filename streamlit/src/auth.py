@@ -1,9 +1,11 @@
 """Authentication module for Streamlit app using AWS Secrets Manager."""
 
+import hashlib
+import hmac
 import json
 import os
-import secrets
-from typing import Optional
+import threading
+from typing import Any, Optional
 
 import boto3
 import streamlit as st
@@ -15,6 +17,20 @@ class AuthenticationError(Exception):
     pass
 
 
+_SM_CLIENT: Optional[Any] = None
+_SM_LOCK = threading.Lock()
+
+
+def _get_secrets_manager_client(region: str) -> Any:
+    """Return the process-wide Secrets Manager client, creating it on first use."""
+    global _SM_CLIENT
+    if _SM_CLIENT is None:
+        with _SM_LOCK:
+            if _SM_CLIENT is None:
+                _SM_CLIENT = boto3.client("secretsmanager", region_name=region)
+    return _SM_CLIENT
+
+
 def get_credentials_from_secrets_manager() -> dict:
     """
     Retrieve authentication credentials from AWS Secrets Manager.
@@ -32,7 +48,7 @@ def get_credentials_from_secrets_manager() -> dict:
     region = os.getenv("AWS_REGION", "us-east-1")
 
     try:
-        client = boto3.client("secretsmanager", region_name=region)
+        client = _get_secrets_manager_client(region)
         response = client.get_secret_value(SecretId=secret_name)
 
         # Parse the secret value
@@ -49,13 +65,26 @@ def get_credentials_from_secrets_manager() -> dict:
         raise AuthenticationError(f"Failed to retrieve credentials: {str(e)}")
 
 
+def _mac(key: bytes, value: str) -> bytes:
+    return hmac.new(key, value.encode("utf-8"), hashlib.sha256).digest()
+
+
 @st.cache_resource
 def load_credentials() -> dict:
     """
     Load and cache credentials from Secrets Manager.
     This is cached to avoid repeated API calls.
+
+    Only HMAC-SHA256 digests of the credentials (under a per-process random key) are kept,
+    so verification compares fixed 32-byte values and the raw secret is not cached.
     """
-    return get_credentials_from_secrets_manager()
+    creds = get_credentials_from_secrets_manager()
+    key = os.urandom(32)
+    return {
+        "key": key,
+        "username_mac": _mac(key, creds["username"]),
+        "password_mac": _mac(key, creds["password"]),
+    }
 
 
 def verify_credentials(username: str, password: str) -> bool:
@@ -74,8 +103,8 @@ def verify_credentials(username: str, password: str) -> bool:
         creds = load_credentials()
 
         # Use constant-time comparison to prevent timing attacks
-        username_match = secrets.compare_digest(username, creds["username"])
-        password_match = secrets.compare_digest(password, creds["password"])
+        username_match = hmac.compare_digest(_mac(creds["key"], username), creds["username_mac"])
+        password_match = hmac.compare_digest(_mac(creds["key"], password), creds["password_mac"])
 
         return username_match and password_match
 
@@ -1,24 +1,53 @@
+import functools
 import os
+import threading
 from decimal import Decimal
 from typing import Any, Dict, List
 
 import boto3
 from boto3 import session as boto3_session
+from botocore.config import Config
 from botocore.exceptions import ClientError
 _DEBUG_PRINTED = False
 
+# Keep the pooled HTTPS connections warm across reruns; the pool covers the dashboard's concurrent day loads
+_BOTO_CONFIG = Config(tcp_keepalive=True, max_pool_connections=32, retries={"mode": "adaptive", "max_attempts": 5})
 
-def _session() -> boto3_session.Session:
+# First calls may come from the dashboard's loader threads; boto3 sessions are not safe for concurrent
+# client()/resource() creation, and functools.cache does not serialize a first call.
+_BOTO_LOCK = threading.RLock()
+_BOTO_CACHE: Dict[str, Any] = {}
+
+
+def _boto_singleton(name: str, factory: Any) -> Any:
+    obj = _BOTO_CACHE.get(name)
+    if obj is None:
+        with _BOTO_LOCK:
+            obj = _BOTO_CACHE.get(name)
+            if obj is None:
+                obj = _BOTO_CACHE[name] = factory()
+    return obj
+
+
+def _new_session() -> boto3_session.Session:
     env_region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION")
     if env_region:
         return boto3_session.Session(region_name=env_region)
     return boto3_session.Session()
 
 
+def _session() -> boto3_session.Session:
+    return _boto_singleton("session", _new_session)
+
+
 def _debug_print_once(ddb_client: Any, table_name: str | None) -> None:
     global _DEBUG_PRINTED
     if _DEBUG_PRINTED:
         return
+    # The ListTables round-trip blocks the first query; only pay it when diagnostics are requested
+    if not os.environ.get("SQA_DEBUG_DDB"):
+        _DEBUG_PRINTED = True
+        return
     try:
         sess = _session()
         region = sess.region_name
@@ -48,8 +77,8 @@ def _debug_print_once(ddb_client: Any, table_name: str | None) -> None:
     )
     _DEBUG_PRINTED = True
 
+import numpy as np
 import pandas as pd
-from boto3.dynamodb.conditions import Key
 
 
 def _to_float(value: Any) -> float | None:
@@ -74,45 +103,78 @@ def _to_int(value: Any) -> int | None:
         return None
 
 
-def _table():
+# Low-level AttributeValue parsing for the query hot paths: the number strings go straight to float/int
+# without the resource layer's Decimal round-trip.
+def _parse_numbers(raw: List[str | None]) -> np.ndarray:
+    # N values are always numeric strings; missing/NULL attributes (None) become NaN
+    return np.fromiter((float(x) if x is not None else np.nan for x in raw), dtype=np.float64, count=len(raw))
+
+
+def _av_int(av: Dict[str, Any] | None) -> int | None:
+    # Numbers arrive as N; segmentStart is stored as an S of digits
+    raw = (av.get("N") or av.get("S")) if av else None
+    if raw is None:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def _ddb_client():
+    return _boto_singleton("client", lambda: _session().client("dynamodb", config=_BOTO_CONFIG))
+
+
+def _ddb_resource():
+    return _boto_singleton("resource", lambda: _session().resource("dynamodb", config=_BOTO_CONFIG))
+
+
+def _table_cached(table_name: str):
+    return _boto_singleton(f"table:{table_name}", lambda: _ddb_resource().Table(table_name))
+
+
+# Resolved lazily rather than at import: app.py loads .env in main(), after this module is imported.
+# A missing variable raises, and functools.cache does not cache exceptions, so it is re-checked next call.
+@functools.cache
+def _table_name() -> str:
     table_name = os.environ.get("TABLE_NAME")
     if not table_name:
         raise RuntimeError("TABLE_NAME environment variable is required")
-    sess = _session()
-    ddb = sess.resource("dynamodb")
-    _debug_print_once(sess.client("dynamodb"), table_name)
-    return ddb.Table(table_name)
+    _debug_print_once(_ddb_client(), table_name)
+    return table_name
 
 
-def _sleep_table():
+@functools.cache
+def _sleep_table_name() -> str:
     table_name = os.environ.get("SLEEP_SESSIONS_TABLE")
     if not table_name:
         raise RuntimeError("SLEEP_SESSIONS_TABLE environment variable is required for sleep views")
-    sess = _session()
-    ddb = sess.resource("dynamodb")
-    _debug_print_once(sess.client("dynamodb"), table_name)
-    return ddb.Table(table_name)
+    _debug_print_once(_ddb_client(), table_name)
+    return table_name
+
+
+def _sleep_table():
+    return _table_cached(_sleep_table_name())
 
 
 def fetch_env_readings(day: str) -> pd.DataFrame:
     """Fetch env readings for a given day (YYYY-MM-DD) from DynamoDB.
 
-    Returns a pandas DataFrame with columns: ts_min, temp_c, humidity_pct.
+    Returns a pandas DataFrame with columns: ts_min, temp_c, humidity_pct, ascending by ts_min (the range key).
     """
-    table = _table()
+    table_name = _table_name()
     items: List[Dict[str, Any]] = []
-    kwargs: Dict[str, Any] = {
-        "KeyConditionExpression": Key("day").eq(day),
-        "ScanIndexForward": True,
-    }
     try:
-        while True:
-            resp = table.query(**kwargs)
-            items.extend(resp.get("Items", []))
-            lek = resp.get("LastEvaluatedKey")
-            if not lek:
-                break
-            kwargs["ExclusiveStartKey"] = lek
+        pages = _ddb_client().get_paginator("query").paginate(
+            TableName=table_name,
+            KeyConditionExpression="#d = :d",
+            ExpressionAttributeNames={"#d": "day"},
+            ExpressionAttributeValues={":d": {"S": day}},
+            ProjectionExpression="ts_min, temp_c, humidity_pct",
+            ScanIndexForward=True,
+        )
+        for page in pages:
+            items.extend(page.get("Items", []))
     except ClientError as e:
         code = e.response.get("Error", {}).get("Code")
         if code == "ResourceNotFoundException":
@@ -121,56 +183,52 @@ def fetch_env_readings(day: str) -> pd.DataFrame:
             ) from e
         raise
 
-    if not items:
-        return pd.DataFrame(columns=["ts_min", "temp_c", "humidity_pct"]).astype({"ts_min": "int64"})
-
-    rows = [
+    # Build parallel columns of the raw number strings in one pass; the dict-of-arrays constructor skips
+    # per-row dict handling and each column is parsed straight into a preallocated float64 array
+    ts_min: List[str] = []
+    temp_c: List[str | None] = []
+    humidity_pct: List[str | None] = []
+    for it in items:
+        if "ts_min" not in it:
+            continue
+        ts_min.append(it["ts_min"]["N"])
+        temp_c.append(it.get("temp_c", {}).get("N"))
+        humidity_pct.append(it.get("humidity_pct", {}).get("N"))
+    return pd.DataFrame(
         {
-            "ts_min": int(it.get("ts_min")),
-            "temp_c": _to_float(it.get("temp_c")),
-            "humidity_pct": _to_float(it.get("humidity_pct")),
+            "ts_min": np.asarray(ts_min).astype("int64"),
+            "temp_c": _parse_numbers(temp_c),
+            "humidity_pct": _parse_numbers(humidity_pct),
         }
-        for it in items
-        if "ts_min" in it
-    ]
-    df = pd.DataFrame(rows)
-    df = df.sort_values("ts_min").reset_index(drop=True)
-    return df
-
+    )
 
-def fetch_env_readings_days(days: List[str]) -> pd.DataFrame:
-    """Fetch env readings for multiple day partitions and concatenate.
 
-    `days` must be strings in YYYY-MM-DD (UTC) format.
-    """
-    frames: List[pd.DataFrame] = []
-    for d in days:
-        frames.append(fetch_env_readings(d))
-    if not frames:
-        return pd.DataFrame(columns=["ts_min", "temp_c", "humidity_pct"]).astype({"ts_min": "int64"})
-    return pd.concat(frames, ignore_index=True).sort_values("ts_min").reset_index(drop=True)
+# Matches the backend SleepStage literal; the order is the hypnogram's y order
+SLEEP_STAGES = ["Deep", "Light", "REM", "Awake"]
+_STAGE_CODES = {name: code for code, name in enumerate(SLEEP_STAGES)}
 
 
 def fetch_sleep_segments(sleep_date: str) -> pd.DataFrame:
     """Fetch per-segment sleep stages for a given sleep_date (YYYY-MM-DD).
 
     Returns a DataFrame with columns: start_ts, end_ts, stage, duration_s.
-    Timestamps are epoch seconds (UTC).
+    Timestamps are epoch seconds (UTC); stage is categorical over SLEEP_STAGES (unknown stages are NaN).
     """
-    table = _sleep_table()
+    table_name = _sleep_table_name()
     items: List[Dict[str, Any]] = []
-    kwargs: Dict[str, Any] = {
-        "KeyConditionExpression": Key("sleepDate").eq(sleep_date),
-        "ScanIndexForward": True,
-    }
     try:
-        while True:
-            resp = table.query(**kwargs)
-            items.extend(resp.get("Items", []))
-            lek = resp.get("LastEvaluatedKey")
-            if not lek:
-                break
-            kwargs["ExclusiveStartKey"] = lek
+        pages = _ddb_client().get_paginator("query").paginate(
+            TableName=table_name,
+            # segmentStart is the range key, so it cannot appear in a FilterExpression. The digit-string segment
+            # keys sort before "SUMMARY", so the key condition excludes that row; the loop below still guards it.
+            KeyConditionExpression="sleepDate = :d AND segmentStart < :s",
+            ExpressionAttributeNames={"#st": "stage"},
+            ExpressionAttributeValues={":d": {"S": sleep_date}, ":s": {"S": "SUMMARY"}},
+            ProjectionExpression="segmentStart, duration_s, #st",
+            ScanIndexForward=True,
+        )
+        for page in pages:
+            items.extend(page.get("Items", []))
     except ClientError as e:
         code = e.response.get("Error", {}).get("Code")
         if code == "ResourceNotFoundException":
@@ -180,33 +238,45 @@ def fetch_sleep_segments(sleep_date: str) -> pd.DataFrame:
         raise
 
     # Exclude the SUMMARY row and any incomplete items
-    rows: List[Dict[str, Any]] = []
+    start_mins: List[int] = []
+    durations: List[int] = []
+    stage_codes: List[int] = []
     for it in items:
-        if str(it.get("segmentStart")) == "SUMMARY":
+        if it.get("segmentStart", {}).get("S") == "SUMMARY":
             continue
         # segmentStart stored as epoch minutes in the backend
-        start_min = _to_int(it.get("segmentStart"))
-        duration_s = _to_int(it.get("duration_s"))
-        stage = it.get("stage")
+        start_min = _av_int(it.get("segmentStart"))
+        duration_s = _av_int(it.get("duration_s"))
+        stage = it.get("stage", {}).get("S")
         if start_min is None or duration_s is None or stage is None:
             continue
-        start_ts = start_min * 60
-        rows.append(
-            {
-                "start_ts": start_ts,
-                "end_ts": start_ts + duration_s,
-                "stage": str(stage),
-                "duration_s": duration_s,
-            }
-        )
+        start_mins.append(start_min)
+        durations.append(duration_s)
+        stage_codes.append(_STAGE_CODES.get(stage, -1))
 
-    if not rows:
-        return pd.DataFrame(columns=["start_ts", "end_ts", "stage", "duration_s"]).astype({"start_ts": "int64"})
+    if not start_mins:
+        return pd.DataFrame(columns=["start_ts", "end_ts", "stage", "duration_s"]).astype(
+            {"start_ts": "int64", "stage": pd.CategoricalDtype(SLEEP_STAGES)}
+        )
 
-    df = pd.DataFrame(rows).sort_values("start_ts").reset_index(drop=True)
+    start_ts = np.asarray(start_mins, dtype="int64") * 60
+    duration_arr = np.asarray(durations, dtype="int64")
+    df = pd.DataFrame(
+        {
+            "start_ts": start_ts,
+            "end_ts": start_ts + duration_arr,
+            # Codes are built while parsing, so no per-row string column is materialized
+            "stage": pd.Categorical.from_codes(stage_codes, categories=SLEEP_STAGES),
+            "duration_s": duration_arr,
+        }
+    )
+    df = df.sort_values("start_ts").reset_index(drop=True)
     return df
 
 
+_SUMMARY_PROJECTION = "sleepDate, score, efficiency, rem_min, deep_min, light_min, total_min, bedtime, risetime"
+
+
 def fetch_sleep_summary(sleep_date: str) -> Dict[str, Any] | None:
     """Fetch the daily summary row for a given sleep_date.
 
@@ -215,7 +285,10 @@ def fetch_sleep_summary(sleep_date: str) -> Dict[str, Any] | None:
     """
     table = _sleep_table()
     try:
-        resp = table.get_item(Key={"sleepDate": sleep_date, "segmentStart": "SUMMARY"})
+        resp = table.get_item(
+            Key={"sleepDate": sleep_date, "segmentStart": "SUMMARY"},
+            ProjectionExpression=_SUMMARY_PROJECTION,
+        )
     except ClientError as e:
         code = e.response.get("Error", {}).get("Code")
         if code == "ResourceNotFoundException":
@@ -1,9 +1,9 @@
 from enum import Enum
-from typing import Dict, List
+from typing import Dict
 
 import numpy as np
 import pandas as pd
-from datetime import tzinfo
+from datetime import datetime, tzinfo
 
 
 class BucketSize(Enum):
@@ -18,30 +18,24 @@ class Percentile(Enum):
     MAX = 1000  # sentinel for max
 
 
-def _bucket_minute(minute_of_day: pd.Series, bucket: BucketSize) -> pd.Series:
+def _bucket_minute(minutes: np.ndarray, bucket: BucketSize) -> np.ndarray:
     size = int(bucket.value)
-    return (minute_of_day // size) * size
+    return (minutes // size) * size
 
 
-def _nan_percentile(values: np.ndarray, p: int) -> float | None:
-    try:
-        return float(np.nanpercentile(values, p))
-    except Exception:
-        return None
+def _utc_offset_minutes(ts_min: int, tz: tzinfo | None) -> int:
+    if tz is None:
+        return 0
+    offset = datetime.fromtimestamp(ts_min * 60, tz).utcoffset()
+    return int(offset.total_seconds() // 60) if offset is not None else 0
 
 
-def _nan_mean(values: np.ndarray) -> float | None:
-    try:
-        return float(np.nanmean(values))
-    except Exception:
-        return None
-
-
-def _nan_max(values: np.ndarray) -> float | None:
-    try:
-        return float(np.nanmax(values))
-    except Exception:
-        return None
+def _min_max_std(values: np.ndarray) -> Dict[str, float | None]:
+    # Drop NaNs once, then run the plain reductions on the compacted array instead of three nan* passes
+    finite = values[~np.isnan(values)]
+    if finite.size == 0:
+        return {"min": None, "max": None, "std": None}
+    return {"min": float(finite.min()), "max": float(finite.max()), "std": float(finite.std())}
 
 
 def aggregate_buckets(df: pd.DataFrame, bucket: BucketSize, local_tz: tzinfo | None = None) -> pd.DataFrame:
@@ -68,41 +62,34 @@ def aggregate_buckets(df: pd.DataFrame, bucket: BucketSize, local_tz: tzinfo | N
             ]
         )
 
-    work = df.copy()
-    # Convert epoch minutes to timezone-aware datetime in local timezone
-    ts = pd.to_datetime(work["ts_min"] * 60, unit="s", utc=True)
+    ts_min = df["ts_min"].to_numpy(dtype="int64")
+    offset = _utc_offset_minutes(int(ts_min.min()), local_tz)
+    if offset == _utc_offset_minutes(int(ts_min.max()), local_tz):
+        # No DST change in range: floor local wall-clock minutes with integer math
+        bucket_min = _bucket_minute(ts_min + offset, bucket) - offset
+    else:
+        local_dt = pd.to_datetime(ts_min * 60, unit="s", utc=True).tz_convert(local_tz)
+        floored = local_dt.floor(f"{int(bucket.value)}min")
+        bucket_min = np.asarray((floored - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(minutes=1), dtype="int64")
+
+    # pandas' Cython group kernels skip NaN and interpolate linearly like np.nanpercentile; quantile()
+    # with a list of q sorts each group once for all three percentiles.
+    cols = {"temp_c": "temp", "humidity_pct": "humidity"}
+    grouped = df[list(cols)].astype(float).groupby(bucket_min, sort=True)
+    means = grouped.mean()
+    maxes = grouped.max()
+    quantiles = grouped.quantile([0.5, 0.9, 0.99]).unstack(level=-1)
+
+    # Only the distinct buckets are turned into datetimes
+    bucket_time = pd.to_datetime(means.index.to_numpy() * 60, unit="s", utc=True)
     if local_tz is not None:
-        ts = ts.dt.tz_convert(local_tz)
-    work["local_dt"] = ts
-
-    bucket_minutes = int(bucket.value)
-    work["bucket_time"] = work["local_dt"].dt.floor(f"{bucket_minutes}min")
-
-    results: List[Dict[str, float | int | None]] = []
-    for bkt, g in work.groupby("bucket_time"):
-        temps = g.get("temp_c")
-        hums = g.get("humidity_pct")
-        t_arr = temps.to_numpy(dtype=float) if temps is not None else np.array([], dtype=float)
-        h_arr = hums.to_numpy(dtype=float) if hums is not None else np.array([], dtype=float)
-
-        row = {
-            "bucket_time": bkt,
-            # temperature
-            "temp_avg": _nan_mean(t_arr),
-            "temp_p50": _nan_percentile(t_arr, 50),
-            "temp_p90": _nan_percentile(t_arr, 90),
-            "temp_p99": _nan_percentile(t_arr, 99),
-            "temp_max": _nan_max(t_arr),
-            # humidity
-            "humidity_avg": _nan_mean(h_arr),
-            "humidity_p50": _nan_percentile(h_arr, 50),
-            "humidity_p90": _nan_percentile(h_arr, 90),
-            "humidity_p99": _nan_percentile(h_arr, 99),
-            "humidity_max": _nan_max(h_arr),
-        }
-        results.append(row)
-
-    out = pd.DataFrame(results).sort_values("bucket_time").reset_index(drop=True)
+        bucket_time = bucket_time.tz_convert(local_tz)
+    out = pd.DataFrame({"bucket_time": bucket_time})
+    for col, prefix in cols.items():
+        out[f"{prefix}_avg"] = means[col].to_numpy(dtype=float)
+        for q, label in ((0.5, "p50"), (0.9, "p90"), (0.99, "p99")):
+            out[f"{prefix}_{label}"] = quantiles[(col, q)].to_numpy(dtype=float)
+        out[f"{prefix}_max"] = maxes[col].to_numpy(dtype=float)
     return out
 
 
@@ -117,21 +104,9 @@ def summarize_timeframe(df: pd.DataFrame) -> Dict[str, Dict[str, float | None]]:
     t = df.get("temp_c").to_numpy(dtype=float)
     h = df.get("humidity_pct").to_numpy(dtype=float)
 
-    def _nan_std(values: np.ndarray) -> float | None:
-        try:
-            return float(np.nanstd(values, ddof=0))
-        except Exception:
-            return None
-
-    def _nan_min(values: np.ndarray) -> float | None:
-        try:
-            return float(np.nanmin(values))
-        except Exception:
-            return None
-
     return {
-        "temperature": {"min": _nan_min(t), "max": _nan_max(t), "std": _nan_std(t)},
-        "humidity": {"min": _nan_min(h), "max": _nan_max(h), "std": _nan_std(h)},
+        "temperature": _min_max_std(t),
+        "humidity": _min_max_std(h),
     }
 
 